@@ -8,7 +8,7 @@ import os
 import sys
 import subprocess
 import tkinter as tk
-from tkinter import filedialog, messagebox, ttk
+from tkinter import filedialog, messagebox, simpledialog, ttk
 import threading
 from pathlib import Path
 import json
@@ -17,6 +17,9 @@ import tempfile
 from datetime import datetime
 import platform
 import shutil
+import asyncio
+import itertools
+import re
 
 # Check available TTS options
 AVAILABLE_ENGINES = {}
@@ -87,6 +90,1234 @@ try:
 except ImportError:
     PDF_SUPPORT = False
 
+# Coqui model names
+XTTS_MODEL = "tts_models/multilingual/multi-dataset/xtts_v2"
+STANDARD_COQUI_MODEL = "tts_models/en/ljspeech/tacotron2-DDC"
+
+
+def clean_page_text(text) -> str:
+    """Collapse whitespace in extracted page text"""
+    if not text:
+        return ""
+    return ' '.join(text.split())
+
+
+def _release_page(page):
+    """Drop pdfplumber's cached layout objects for a page we are done with"""
+    if hasattr(page, "close"):
+        page.close()
+    elif hasattr(page, "flush_cache"):
+        page.flush_cache()
+
+
+def extract_pdf_text(pdf_path: str) -> list:
+    """Extract cleaned text for every page of a PDF"""
+    if not PDF_SUPPORT:
+        raise ImportError("PDF libraries not installed. Click 'Install All Dependencies'")
+
+    pages_text = []
+    try:
+        with pdfplumber.open(pdf_path) as pdf:
+            for page in pdf.pages:
+                pages_text.append(clean_page_text(page.extract_text()))
+                _release_page(page)
+    except Exception as e:
+        # Fallback to PyPDF2
+        pages_text = []
+        with open(pdf_path, 'rb') as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            for page in pdf_reader.pages:
+                pages_text.append(clean_page_text(page.extract_text()))
+
+    return pages_text
+
+
+# Low-memory mode
+LOW_MEMORY_WINDOW = 25  # pages between pdfminer object-cache flushes
+
+
+def current_rss_mb():
+    """Resident memory of this process in MB, or None if it can't be measured"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def check_rss_ceiling(max_rss_mb):
+    """Raise MemoryError if RSS stays above max_rss_mb after a garbage collection"""
+    if not max_rss_mb:
+        return
+    rss = current_rss_mb()
+    if rss is None or rss <= max_rss_mb:
+        return
+    import gc
+    gc.collect()
+    rss = current_rss_mb()
+    if rss > max_rss_mb:
+        raise MemoryError(f"Memory use {rss:.0f} MB exceeds the {max_rss_mb:.0f} MB ceiling")
+
+
+def count_pdf_pages(pdf_path: str) -> int:
+    """Page count without parsing any page content"""
+    with open(pdf_path, 'rb') as file:
+        return len(PyPDF2.PdfReader(file).pages)
+
+
+def iter_pdf_pages(pdf_path: str, window_size: int = LOW_MEMORY_WINDOW, max_rss_mb: float = None):
+    """Yield (page_num, total_pages, text) while holding at most one window of pages
+
+    The PDF is opened once and its page tree is walked lazily, so no page is
+    looked up twice. Each page's cache is flushed as soon as its text is
+    extracted and pdfminer's object cache is cleared after every window of
+    window_size pages. A page that pdfplumber can't read is retried with PyPDF2,
+    whose reader works on a file handle and is dropped at the same flushes.
+    """
+    if not PDF_SUPPORT:
+        raise ImportError("PDF libraries not installed. Click 'Install All Dependencies'")
+
+    import gc
+    from pdfminer.pdfpage import PDFPage
+    from pdfminer.pdftypes import resolve1
+    from pdfplumber.page import Page
+
+    fallback = []  # (file, PyPDF2 reader), only opened if pdfplumber fails on a page
+
+    def fallback_text(page_num):
+        if not fallback:
+            # A file handle, not a path: PdfReader(path) reads the whole file into memory
+            file = open(pdf_path, 'rb')
+            fallback.append((file, PyPDF2.PdfReader(file)))
+        return clean_page_text(fallback[0][1].pages[page_num - 1].extract_text())
+
+    def drop_fallback():
+        # The reader caches every flattened page and resolved object it has seen
+        if fallback:
+            fallback.pop()[0].close()
+
+    # Not a with-block: PDF.close() builds a Page for every page just to close it
+    pdf = pdfplumber.open(pdf_path)
+    try:
+        try:
+            total_pages = int(resolve1(resolve1(pdf.doc.catalog["Pages"])["Count"]))
+        except Exception:
+            total_pages = count_pdf_pages(pdf_path)
+        page_objs = PDFPage.create_pages(pdf.doc)
+
+        for page_num in range(1, total_pages + 1):
+            try:
+                page = Page(pdf, next(page_objs), page_number=page_num)
+                text = clean_page_text(page.extract_text())
+                _release_page(page)
+                del page
+            except MemoryError:
+                raise
+            except Exception:
+                text = fallback_text(page_num)
+
+            check_rss_ceiling(max_rss_mb)
+            yield page_num, total_pages, text
+
+            if page_num % window_size == 0:
+                for cache in ("_cached_objs", "_parsed_objs"):
+                    getattr(pdf.doc, cache, {}).clear()
+                drop_fallback()
+                gc.collect()
+    finally:
+        drop_fallback()
+        pdf.stream.close()
+
+
+# Words whose trailing period doesn't end a sentence ("Dr. Smith", "et al. found")
+SENTENCE_ABBREVIATIONS = ("Mr", "Mrs", "Ms", "Dr", "Prof", "Sr", "Jr", "St", "Mt",
+                          "vs", "etc", "No", "Fig", "Vol", "Ch", "pp", "cf", "al")
+# A period after an abbreviation or a single letter (initials, e.g., i.e.) is
+# not a sentence end, and the next sentence must start with a capital or digit
+SENTENCE_END = re.compile(
+    r'(?:' + ''.join(rf'(?<!\b{abbr})' for abbr in SENTENCE_ABBREVIATIONS) + r'(?<!\b[A-HJ-Za-z])\.|[!?…])'
+    r'["\'”’)\]]*'
+    r'(?=\s+["\'“‘(\[]*[A-Z0-9À-ÖØ-Þ]|\s*$)'
+)
+
+
+def ends_sentence(text: str) -> bool:
+    """True if text finishes with sentence-ending punctuation"""
+    text = text.rstrip()
+    return any(match.end() == len(text) for match in SENTENCE_END.finditer(text, max(0, len(text) - 8)))
+
+
+def split_trailing_fragment(text: str, max_fragment_chars: int = 400):
+    """Split text into (complete sentences, unfinished last sentence)
+
+    The fragment is left in place ('' returned) when there is no complete
+    sentence before it or it is longer than max_fragment_chars.
+    """
+    last_end = None
+    for match in SENTENCE_END.finditer(text):
+        last_end = match.end()
+    if last_end is None:
+        return text, ""
+    fragment = text[last_end:].strip()
+    if not fragment or len(fragment) > max_fragment_chars:
+        return text, ""
+    return text[:last_end].rstrip(), fragment
+
+
+def carry_sentence_fragments(pages):
+    """Move each page's unfinished last sentence to the start of the next page
+
+    Takes and yields (page_num, total_pages, text) tuples, with an extra
+    ends_sentence flag on the output, so TTS never has to voice half a
+    sentence at a page break. Looks ahead one page only.
+    """
+    pending = None
+    for page_num, total_pages, text in pages:
+        if pending is not None:
+            pending_num, pending_total, pending_text = pending
+            if pending_text.strip() and text.strip():
+                head, fragment = split_trailing_fragment(pending_text)
+                if fragment:
+                    pending_text, text = head, f"{fragment} {text}"
+            yield pending_num, pending_total, pending_text, ends_sentence(pending_text)
+        pending = (page_num, total_pages, text)
+    if pending is not None:
+        yield pending + (True,)
+
+
+# Voice samples
+DEFAULT_VOICE_LIBRARY = "voice_library"
+VOICE_SAMPLE_RATE = 22050  # XTTS conditioning rate
+VOICE_TARGET_LUFS = -23.0
+MIN_VOICE_SECONDS = 3.0
+MAX_VOICE_SECONDS = 60.0
+
+
+def load_audio(path: str):
+    """Decode an audio file to mono float32 samples, returning (samples, sample_rate)"""
+    import numpy as np
+    try:
+        import soundfile as sf
+        samples, sample_rate = sf.read(str(path), dtype='float32', always_2d=False)
+    except Exception:
+        # MP3/M4A and other formats libsndfile can't decode
+        import librosa
+        samples, sample_rate = librosa.load(str(path), sr=None, mono=False)
+        samples = samples.T
+    samples = np.asarray(samples, dtype=np.float32)
+    if samples.ndim > 1:
+        samples = samples.mean(axis=1)
+    return samples, int(sample_rate)
+
+
+def resample_audio(samples, sample_rate: int, target_rate: int):
+    """Polyphase resampling to target_rate"""
+    if sample_rate == target_rate:
+        return samples
+    import math
+    import numpy as np
+    from scipy.signal import resample_poly
+    divisor = math.gcd(sample_rate, target_rate)
+    return resample_poly(samples, target_rate // divisor, sample_rate // divisor).astype(np.float32)
+
+
+def frame_levels_db(samples, frame: int):
+    """RMS level in dBFS of each complete frame (vectorized)"""
+    import numpy as np
+    mono = samples if samples.ndim == 1 else samples.mean(axis=1)
+    count = len(mono) // frame
+    frames = mono[:count * frame].reshape(count, frame).astype(np.float64)
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    return 20 * np.log10(np.maximum(rms, 1e-10))
+
+
+def silence_bounds(samples, sample_rate: int, threshold_db: float = -45.0, relative_to_peak: bool = True,
+                   frame_ms: float = 20, pad_ms: float = 50):
+    """(start, end) sample indices of the non-silent region, or (0, 0) if all silent
+
+    threshold_db is measured against the loudest frame when relative_to_peak,
+    otherwise against full scale. pad_ms of audio is kept on both sides.
+    """
+    import numpy as np
+    frame = max(1, int(sample_rate * frame_ms / 1000))
+    levels = frame_levels_db(samples, frame)
+    if len(levels) == 0:
+        return 0, len(samples)
+    if relative_to_peak:
+        levels = levels - levels.max()
+    voiced = np.flatnonzero(levels > threshold_db)
+    if len(voiced) == 0:
+        return 0, 0
+    pad = int(sample_rate * pad_ms / 1000)
+    return max(0, voiced[0] * frame - pad), min(len(samples), (voiced[-1] + 1) * frame + pad)
+
+
+def trim_silence(samples, sample_rate: int, threshold_db: float = -45.0, relative_to_peak: bool = True):
+    """Cut leading and trailing silence"""
+    start, end = silence_bounds(samples, sample_rate, threshold_db, relative_to_peak)
+    return samples[start:end]
+
+
+class LoudnessMeter:
+    """EBU R128 / ITU-R BS.1770 integrated loudness, fed block by block
+
+    K-weighting filter state is carried between add() calls, so a long
+    signal can be measured in chunks and gives the same result as measuring
+    it in one go. Only the energy of each 100 ms step is kept in memory.
+    """
+
+    ABSOLUTE_GATE = -70.0
+    RELATIVE_GATE = -10.0
+
+    def __init__(self, sample_rate: int, channels: int = 1):
+        import math
+        import numpy as np
+
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.step = int(round(sample_rate * 0.1))
+
+        # Stage 1: high-shelf (head acoustics)
+        K = math.tan(math.pi * 1681.974450955533 / sample_rate)
+        Q = 0.7071752369554196
+        Vh = 10 ** (3.999843853973347 / 20)
+        Vb = Vh ** 0.4996667741545416
+        a0 = 1 + K / Q + K * K
+        shelf_b = [(Vh + Vb * K / Q + K * K) / a0, 2 * (K * K - Vh) / a0, (Vh - Vb * K / Q + K * K) / a0]
+        shelf_a = [1.0, 2 * (K * K - 1) / a0, (1 - K / Q + K * K) / a0]
+
+        # Stage 2: RLB high-pass
+        K = math.tan(math.pi * 38.13547087602444 / sample_rate)
+        Q = 0.5003270373238773
+        a0 = 1 + K / Q + K * K
+        highpass_b = [1.0, -2.0, 1.0]
+        highpass_a = [1.0, 2 * (K * K - 1) / a0, (1 - K / Q + K * K) / a0]
+
+        self._filters = [(np.array(shelf_b), np.array(shelf_a)), (np.array(highpass_b), np.array(highpass_a))]
+        self._state = [np.zeros((2, channels)) for _ in self._filters]
+        self._carry = np.zeros(0)
+        self._step_energy = []
+
+    def add(self, block):
+        """Feed the next block of float samples, shape (n,) or (n, channels)"""
+        import numpy as np
+        from scipy.signal import lfilter
+
+        block = np.asarray(block, dtype=np.float64)
+        if block.ndim == 1:
+            block = block[:, None]
+        for i, (b, a) in enumerate(self._filters):
+            block, self._state[i] = lfilter(b, a, block, axis=0, zi=self._state[i])
+
+        power = np.concatenate([self._carry, np.sum(block * block, axis=1)])
+        steps = len(power) // self.step
+        if steps:
+            self._step_energy.extend(power[:steps * self.step].reshape(steps, self.step).sum(axis=1).tolist())
+        self._carry = power[steps * self.step:]
+
+    def integrated(self) -> float:
+        """Gated integrated loudness in LUFS (-inf for silence or under 400 ms)"""
+        import numpy as np
+
+        steps = np.asarray(self._step_energy)
+        if len(steps) < 4:
+            return float("-inf")
+        # 400 ms blocks with 75% overlap = sums of 4 consecutive 100 ms steps
+        blocks = np.convolve(steps, np.ones(4), mode="valid") / (4 * self.step)
+        with np.errstate(divide="ignore"):
+            loudness = -0.691 + 10 * np.log10(blocks)
+
+        gated = blocks[loudness > self.ABSOLUTE_GATE]
+        if len(gated) == 0:
+            return float("-inf")
+        relative_gate = -0.691 + 10 * np.log10(gated.mean()) + self.RELATIVE_GATE
+        gated = blocks[(loudness > self.ABSOLUTE_GATE) & (loudness > relative_gate)]
+        return float(-0.691 + 10 * np.log10(gated.mean()))
+
+
+def normalize_loudness(samples, sample_rate: int, target_lufs: float = VOICE_TARGET_LUFS,
+                       peak_ceiling_db: float = -1.0):
+    """Scale samples to target_lufs without letting peaks exceed peak_ceiling_db"""
+    import numpy as np
+
+    meter = LoudnessMeter(sample_rate, 1 if samples.ndim == 1 else samples.shape[1])
+    meter.add(samples)
+    loudness = meter.integrated()
+    if not np.isfinite(loudness):
+        return samples, loudness
+
+    gain = 10 ** ((target_lufs - loudness) / 20)
+    peak = float(np.max(np.abs(samples))) * gain
+    ceiling = 10 ** (peak_ceiling_db / 20)
+    if peak > ceiling:
+        gain *= ceiling / peak
+    return (samples * gain).astype(np.float32), loudness
+
+
+def preprocess_voice_sample(path: str):
+    """Decode, resample, trim and loudness-normalize a voice sample
+
+    Returns (samples, sample_rate, info). Raises ValueError for samples that
+    are silent or too short to clone from.
+    """
+    samples, sample_rate = load_audio(path)
+    samples = resample_audio(samples, sample_rate, VOICE_SAMPLE_RATE)
+    samples = trim_silence(samples, VOICE_SAMPLE_RATE)
+
+    duration = len(samples) / VOICE_SAMPLE_RATE
+    if duration < MIN_VOICE_SECONDS:
+        raise ValueError(f"Voice sample has only {duration:.1f}s of speech - at least "
+                         f"{MIN_VOICE_SECONDS:.0f}s needed (30+ seconds recommended)")
+    if duration > MAX_VOICE_SECONDS:
+        samples = samples[:int(MAX_VOICE_SECONDS * VOICE_SAMPLE_RATE)]
+        duration = MAX_VOICE_SECONDS
+
+    samples, source_loudness = normalize_loudness(samples, VOICE_SAMPLE_RATE)
+    return samples, VOICE_SAMPLE_RATE, {
+        "duration": round(duration, 2),
+        "source_loudness_lufs": round(source_loudness, 2),
+        "original_sample_rate": sample_rate
+    }
+
+
+def sample_cache_key(sample_path: str):
+    """Cache key for a voice sample that changes when the file is rewritten"""
+    try:
+        stat = os.stat(sample_path)
+        return (sample_path, stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return (sample_path, None, None)
+
+
+class VoiceLibrary:
+    """Preprocessed narrator voices with precomputed XTTS speaker embeddings
+
+    Layout of the library folder:
+        voices.db                  SQLite index, one row per voice name
+        <name>.wav                 cleaned 22.05 kHz mono sample
+        <name>.latents.npz         XTTS conditioning latents for the sample
+    """
+
+    def __init__(self, root: str = DEFAULT_VOICE_LIBRARY):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.root / "voices.db"
+        self._latents = {}
+        self._lock = threading.Lock()
+
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS voices (
+                    name TEXT PRIMARY KEY,
+                    sample_path TEXT NOT NULL UNIQUE,
+                    source_path TEXT NOT NULL,
+                    source_sha256 TEXT NOT NULL,
+                    duration REAL NOT NULL,
+                    source_loudness_lufs REAL,
+                    embedding_path TEXT,
+                    created_at REAL NOT NULL
+                )
+            """)
+
+    def _connect(self):
+        import sqlite3
+        conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return _ClosingConnection(conn)
+
+    @staticmethod
+    def _file_sha256(path: str) -> str:
+        import hashlib
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def add(self, name: str, source_path: str, compute_embedding: bool = True, tts=None) -> dict:
+        """Preprocess a sample and store it under name (re-adding the same file is a no-op)
+
+        tts is an already loaded XTTS model to compute the embedding with.
+        """
+        import re
+        import soundfile as sf
+
+        if not re.fullmatch(r"[A-Za-z0-9_-]+", name):
+            raise ValueError("Voice names may only contain letters, digits, '-' and '_'")
+        if not os.path.exists(source_path):
+            raise FileNotFoundError(f"Voice sample file not found: {source_path}")
+
+        sha256 = self._file_sha256(source_path)
+        existing = self.get(name)
+        if existing and existing["source_sha256"] == sha256 and os.path.exists(existing["sample_path"]):
+            if compute_embedding and not existing["embedding_path"] and AVAILABLE_ENGINES.get('coqui'):
+                self.compute_embedding(name, tts)
+            return self.get(name)
+
+        samples, sample_rate, info = preprocess_voice_sample(source_path)
+        sample_path = self.root / f"{name}.wav"
+        sf.write(str(sample_path), samples, sample_rate, subtype="PCM_16")
+
+        embedding_path = self.root / f"{name}.latents.npz"
+        if embedding_path.exists():
+            embedding_path.unlink()
+        self._forget(str(sample_path))
+
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO voices (name, sample_path, source_path, source_sha256, duration, "
+                "source_loudness_lufs, embedding_path, created_at) VALUES (?, ?, ?, ?, ?, ?, NULL, ?)",
+                (name, str(sample_path), str(source_path), sha256, info["duration"],
+                 info["source_loudness_lufs"], time.time())
+            )
+        print(f"🎤 Voice '{name}' saved: {info['duration']}s, was {info['source_loudness_lufs']} LUFS")
+
+        if compute_embedding and AVAILABLE_ENGINES.get('coqui'):
+            self.compute_embedding(name, tts)
+        return self.get(name)
+
+    def compute_embedding(self, name: str, tts=None):
+        """Compute and store XTTS speaker latents for a saved voice"""
+        import numpy as np
+
+        voice = self.get(name)
+        if voice is None:
+            raise KeyError(f"Unknown voice: {name}")
+        tts = tts or SpeechEngine().load_coqui_model(XTTS_MODEL)
+        gpt_cond_latent, speaker_embedding = tts.synthesizer.tts_model.get_conditioning_latents(
+            audio_path=[voice["sample_path"]])
+
+        embedding_path = self.root / f"{name}.latents.npz"
+        np.savez(str(embedding_path),
+                 gpt_cond_latent=gpt_cond_latent.cpu().numpy(),
+                 speaker_embedding=speaker_embedding.cpu().numpy())
+        with self._connect() as conn:
+            conn.execute("UPDATE voices SET embedding_path = ? WHERE name = ?", (str(embedding_path), name))
+        self._forget(voice["sample_path"])
+        with self._lock:
+            self._latents[sample_cache_key(voice["sample_path"])] = (gpt_cond_latent, speaker_embedding)
+        print(f"🧬 Speaker embedding stored for '{name}'")
+        return gpt_cond_latent, speaker_embedding
+
+    def get(self, name: str):
+        """Voice record by name, or None"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM voices WHERE name = ?", (name,)).fetchone()
+            return dict(row) if row else None
+
+    def voices(self) -> list:
+        with self._connect() as conn:
+            return [dict(row) for row in conn.execute("SELECT * FROM voices ORDER BY name")]
+
+    def names(self) -> list:
+        return [voice["name"] for voice in self.voices()]
+
+    def sample_path(self, name: str) -> str:
+        """Path of the cleaned sample for a voice name"""
+        voice = self.get(name)
+        if voice is None:
+            raise KeyError(f"Unknown voice: {name}")
+        return voice["sample_path"]
+
+    def remove(self, name: str) -> bool:
+        voice = self.get(name)
+        if voice is None:
+            return False
+        for path in (voice["sample_path"], voice["embedding_path"]):
+            if path and os.path.exists(path):
+                os.unlink(path)
+        self._forget(voice["sample_path"])
+        with self._connect() as conn:
+            conn.execute("DELETE FROM voices WHERE name = ?", (name,))
+        return True
+
+    def _forget(self, sample_path: str):
+        """Drop every cached version of a sample's latents"""
+        with self._lock:
+            for key in [key for key in self._latents if key[0] == sample_path]:
+                del self._latents[key]
+
+    def latents_for_sample(self, sample_path: str, tts=None):
+        """Stored latents for a library sample path; None if the path isn't in the library"""
+        key = sample_cache_key(sample_path)
+        with self._lock:
+            if key in self._latents:
+                return self._latents[key]
+
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM voices WHERE sample_path = ?", (sample_path,)).fetchone()
+        if row is None:
+            return None
+        if not row["embedding_path"] or not os.path.exists(row["embedding_path"]):
+            return self.compute_embedding(row["name"], tts)
+
+        import numpy as np
+        import torch
+        with np.load(row["embedding_path"]) as data:
+            latents = (torch.from_numpy(data["gpt_cond_latent"]), torch.from_numpy(data["speaker_embedding"]))
+        self._forget(sample_path)
+        with self._lock:
+            self._latents[key] = latents
+        return latents
+
+
+def open_voice_library(root: str = DEFAULT_VOICE_LIBRARY):
+    """The voice library at root, or None if none has been created there"""
+    if (Path(root) / "voices.db").exists():
+        return VoiceLibrary(root)
+    return None
+
+
+# Audiobook post-processing
+AUDIOBOOK_FILE = "audiobook.wav"
+AUDIOBOOK_TARGET_LUFS = -23.0  # EBU R128
+
+
+class AudiobookStitcher:
+    """Appends page audio to one loudness-normalized audiobook file as pages are produced
+
+    Each page is decoded, resampled to the book's rate, trimmed of leading and
+    trailing silence and normalized to target_lufs before it is written, so
+    only one page plus a few milliseconds of the previous one are ever in
+    memory. Pages that end mid-sentence are joined with an equal-power
+    crossfade; pages that end a sentence get a natural pause instead.
+    """
+
+    def __init__(self, output_path: str, sample_rate: int = None, target_lufs: float = AUDIOBOOK_TARGET_LUFS,
+                 silence_threshold_db: float = -50.0, crossfade_ms: float = 30, sentence_pause_ms: float = 450,
+                 fade_ms: float = 10):
+        self.output_path = str(output_path)
+        self.sample_rate = sample_rate
+        self.target_lufs = target_lufs
+        self.silence_threshold_db = silence_threshold_db
+        self.crossfade_ms = crossfade_ms
+        self.sentence_pause_ms = sentence_pause_ms
+        self.fade_ms = fade_ms
+
+        self.pages = 0
+        self.frames = 0
+        self._writer = None
+        self._meter = None
+        self._tail = None
+        self._tail_ends_sentence = True
+
+    def _open(self, sample_rate: int):
+        import soundfile as sf
+        self.sample_rate = self.sample_rate or sample_rate
+        self._writer = sf.SoundFile(self.output_path, 'w', samplerate=self.sample_rate, channels=1, subtype="PCM_16")
+        self._meter = LoudnessMeter(self.sample_rate)
+        self._crossfade = max(1, int(self.sample_rate * self.crossfade_ms / 1000))
+        self._fade = max(1, int(self.sample_rate * self.fade_ms / 1000))
+
+    def _write(self, block):
+        import numpy as np
+        if len(block):
+            block = np.clip(block, -1.0, 1.0)
+            self._writer.write(block)
+            self._meter.add(block)
+            self.frames += len(block)
+
+    def add_page(self, page_path: str, ends_sentence: bool = True) -> bool:
+        """Append one page; returns False if it could not be decoded or is silent"""
+        import numpy as np
+
+        try:
+            samples, sample_rate = load_audio(page_path)
+        except Exception as e:
+            print(f"⚠️  Could not stitch {os.path.basename(page_path)}: {e}")
+            return False
+        if self._writer is None:
+            self._open(sample_rate)
+
+        samples = resample_audio(samples, sample_rate, self.sample_rate)
+        start, end = silence_bounds(samples, self.sample_rate, self.silence_threshold_db,
+                                    relative_to_peak=False, pad_ms=self.fade_ms)
+        samples = samples[start:end]
+        if len(samples) <= self._crossfade:
+            return False
+        samples, _ = normalize_loudness(samples, self.sample_rate, self.target_lufs)
+
+        # Short fades on trimmed edges avoid clicks
+        ramp = np.linspace(0.0, 1.0, min(self._fade, len(samples) // 2), dtype=np.float32)
+        samples[:len(ramp)] *= ramp
+        samples[len(samples) - len(ramp):] *= ramp[::-1]
+
+        if self._tail is None:
+            body = samples
+        elif self._tail_ends_sentence:
+            self._write(self._tail)
+            self._write(np.zeros(int(self.sample_rate * self.sentence_pause_ms / 1000), dtype=np.float32))
+            body = samples
+        else:
+            n = min(self._crossfade, len(self._tail))
+            t = np.linspace(0.0, np.pi / 2, n, dtype=np.float32)
+            self._write(self._tail[:len(self._tail) - n])
+            self._write(self._tail[len(self._tail) - n:] * np.cos(t) + samples[:n] * np.sin(t))
+            body = samples[n:]
+
+        # Hold back the end of this page for the next join
+        split = max(0, len(body) - self._crossfade)
+        self._write(body[:split])
+        self._tail = body[split:].copy()
+        self._tail_ends_sentence = ends_sentence
+        self.pages += 1
+        return True
+
+    def close(self):
+        """Finish the file; returns a summary dict, or None if no page was added"""
+        if self._writer is None:
+            return None
+        if self._tail is not None:
+            self._write(self._tail)
+            self._tail = None
+        self._writer.close()
+        self._writer = None
+        if not self.pages:
+            os.unlink(self.output_path)
+            return None
+        return {
+            "file": self.output_path,
+            "pages": self.pages,
+            "duration_seconds": round(self.frames / self.sample_rate, 2),
+            "sample_rate": self.sample_rate,
+            "integrated_loudness_lufs": round(self._meter.integrated(), 2)
+        }
+
+
+class SpeechEngine:
+    """GUI-independent TTS runner that keeps loaded models warm between calls"""
+
+    def __init__(self, engine: str = "system", voice_sample_path: str = "", use_voice_cloning: bool = False,
+                 voice_library: VoiceLibrary = None):
+        self.engine = engine
+        self.voice_sample_path = voice_sample_path or ""
+        self.use_voice_cloning = use_voice_cloning
+        self.voice_library = voice_library
+
+        # Warm caches - Coqui models by name, XTTS speaker latents by sample path
+        self._coqui_models = {}
+        self._speaker_latents = {}
+
+    @property
+    def cloning_active(self) -> bool:
+        """True when this engine will clone the configured voice sample"""
+        return bool(self.engine == 'coqui' and self.use_voice_cloning and self.voice_sample_path)
+
+    def generate(self, text: str, output_path: str, engine: str = None) -> bool:
+        """Generate audio file using the configured engine (or the one given)"""
+        engine = engine or self.engine
+        try:
+            if engine == 'coqui':
+                return self.coqui_tts(text, output_path)
+            elif engine == 'pyttsx3':
+                return self.pyttsx3_tts(text, output_path)
+            elif engine == 'edge':
+                return self.edge_tts(text, output_path)
+            else:
+                return self.system_tts(text, output_path)
+        except Exception as e:
+            print(f"❌ Error generating audio: {e}")
+            return False
+
+    def system_tts(self, text: str, output_path: str) -> bool:
+        """Windows system TTS"""
+        try:
+            safe_text = text.replace('"', '""')
+            ps_script = f'''
+Add-Type -AssemblyName System.Speech
+$synth = New-Object System.Speech.Synthesis.SpeechSynthesizer
+$synth.SetOutputToWaveFile("{output_path}")
+$synth.Speak("{safe_text}")
+$synth.Dispose()
+'''
+            with tempfile.NamedTemporaryFile(mode='w', suffix='.ps1', delete=False) as f:
+                f.write(ps_script)
+                script_path = f.name
+
+            result = subprocess.run(['powershell', '-ExecutionPolicy', 'Bypass', '-File', script_path],
+                                  capture_output=True)
+
+            os.unlink(script_path)
+            return result.returncode == 0 and os.path.exists(output_path)
+
+        except Exception as e:
+            print(f"System TTS failed: {e}")
+            return False
+
+    def pyttsx3_tts(self, text: str, output_path: str) -> bool:
+        """pyttsx3 TTS"""
+        try:
+            import pyttsx3
+            engine = pyttsx3.init()
+            engine.save_to_file(text, output_path)
+            engine.runAndWait()
+            return os.path.exists(output_path)
+        except Exception as e:
+            print(f"pyttsx3 TTS failed: {e}")
+            return False
+
+    def edge_tts(self, text: str, output_path: str) -> bool:
+        """Microsoft Edge TTS"""
+        try:
+            import asyncio
+            import edge_tts
+
+            async def generate():
+                voice = "en-US-JennyNeural"
+                communicate = edge_tts.Communicate(text, voice)
+                await communicate.save(output_path)
+
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            loop.run_until_complete(generate())
+            loop.close()
+
+            return os.path.exists(output_path)
+        except Exception as e:
+            print(f"Edge TTS failed: {e}")
+            return False
+
+    def load_coqui_model(self, model_name: str):
+        """Load a Coqui model once and reuse it for every later call"""
+        if model_name not in self._coqui_models:
+            from TTS.api import TTS
+            print(f"⏳ Loading Coqui model: {model_name}")
+            self._coqui_models[model_name] = TTS(model_name, gpu=False)
+        return self._coqui_models[model_name]
+
+    def get_speaker_latents(self, tts, sample_path: str):
+        """Compute XTTS conditioning latents for a voice sample once (library voices load from disk)
+
+        Keyed on the file's mtime and size, so re-saving a library voice
+        under the same name is picked up by warm engines.
+        """
+        key = sample_cache_key(sample_path)
+        if key not in self._speaker_latents:
+            latents = self.voice_library.latents_for_sample(sample_path, tts) if self.voice_library else None
+            if latents is None:
+                latents = tts.synthesizer.tts_model.get_conditioning_latents(audio_path=[sample_path])
+            for stale in [k for k in self._speaker_latents if k[0] == sample_path]:
+                del self._speaker_latents[stale]
+            self._speaker_latents[key] = latents
+        return self._speaker_latents[key]
+
+    def coqui_tts(self, text: str, output_path: str) -> bool:
+        """Coqui TTS with voice cloning"""
+        try:
+            if self.use_voice_cloning and self.voice_sample_path:
+                # Use XTTS for voice cloning
+                tts = self.load_coqui_model(XTTS_MODEL)
+                try:
+                    self._xtts_with_cached_latents(tts, text, output_path)
+                except AttributeError:
+                    # Older TTS releases don't expose the XTTS model directly
+                    tts.tts_to_file(
+                        text=text,
+                        speaker_wav=self.voice_sample_path,
+                        language="en",
+                        file_path=output_path
+                    )
+            else:
+                # Use standard TTS
+                tts = self.load_coqui_model(STANDARD_COQUI_MODEL)
+                tts.tts_to_file(text=text, file_path=output_path)
+
+            return os.path.exists(output_path)
+        except Exception as e:
+            print(f"Coqui TTS failed: {e}")
+            return False
+
+    def _xtts_with_cached_latents(self, tts, text: str, output_path: str):
+        """Synthesize sentence by sentence from cached speaker latents"""
+        import numpy as np
+
+        synthesizer = tts.synthesizer
+        gpt_cond_latent, speaker_embedding = self.get_speaker_latents(tts, self.voice_sample_path)
+        pause = np.zeros(int(synthesizer.output_sample_rate * 0.2), dtype=np.float32)
+
+        wavs = []
+        for sentence in synthesizer.split_into_sentences(text):
+            out = synthesizer.tts_model.inference(sentence, "en", gpt_cond_latent, speaker_embedding)
+            wavs.extend([np.asarray(out["wav"], dtype=np.float32), pause])
+
+        synthesizer.save_wav(wav=np.concatenate(wavs) if wavs else pause, path=output_path)
+
+
+class LatencyTracker:
+    """Thread-safe per-engine call latencies with p50/p95/p99 summaries
+
+    Only successful calls go into the percentiles; failures and timeouts are
+    counted separately with their own mean duration. A tracker with a parent
+    also records every call there, so one conversion can keep its own numbers
+    while a pool or service keeps running totals.
+    """
+
+    def __init__(self, max_samples: int = 2048, parent: "LatencyTracker" = None):
+        from collections import deque
+        self._deque = deque
+        self.max_samples = max_samples
+        self.parent = parent
+        self._samples = {}
+        self._totals = {}
+        self._lock = threading.Lock()
+
+    def record(self, engine: str, seconds: float, ok: bool = True):
+        with self._lock:
+            if engine not in self._samples:
+                self._samples[engine] = self._deque(maxlen=self.max_samples)
+                self._totals[engine] = {"calls": 0, "failures": 0, "failure_seconds": 0.0}
+            totals = self._totals[engine]
+            totals["calls"] += 1
+            if ok:
+                self._samples[engine].append(seconds)
+            else:
+                totals["failures"] += 1
+                totals["failure_seconds"] += seconds
+        if self.parent is not None:
+            self.parent.record(engine, seconds, ok)
+
+    @staticmethod
+    def _percentile(ordered: list, pct: float) -> float:
+        """Nearest-rank percentile of an already sorted list"""
+        import math
+        rank = max(1, math.ceil(pct / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+    def summary(self) -> dict:
+        """{engine: {calls, failures, mean_failure_seconds, p50, p95, p99}} in seconds"""
+        with self._lock:
+            snapshot = {engine: (sorted(samples), dict(self._totals[engine]))
+                        for engine, samples in self._samples.items()}
+        result = {}
+        for engine, (ordered, totals) in snapshot.items():
+            failure_seconds = totals.pop("failure_seconds")
+            totals["mean_failure_seconds"] = round(failure_seconds / totals["failures"], 3) if totals["failures"] else None
+            totals.update({f"p{pct}": round(self._percentile(ordered, pct), 3) if ordered else None
+                           for pct in (50, 95, 99)})
+            result[engine] = totals
+        return result
+
+
+class CircuitBreaker:
+    """Stops calling an engine after repeated failures, then probes it again
+
+    closed -> open after failure_threshold consecutive failures; open ->
+    half-open after reset_seconds, letting one call through; that call's
+    result closes or re-opens the breaker.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold: int = 3, reset_seconds: float = 60):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_seconds:
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def wait_until_allowed(self, poll_seconds: float = 0.5):
+        """Block until allow() lets a call through (the next half-open probe)"""
+        while not self.allow():
+            with self._lock:
+                remaining = self.reset_seconds - (time.monotonic() - self.opened_at)
+            time.sleep(min(max(remaining, 0.0), poll_seconds) or poll_seconds)
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+
+class AllEnginesFailing(RuntimeError):
+    """Every engine's circuit is open and the retry probe failed too"""
+
+
+class ChunkExecutionPolicy:
+    """Runs one chunk of text through TTS with timeout, breaker, fallback and hedging
+
+    run(engine, text, output_path) -> bool does the actual synthesis. Every
+    attempt writes to its own temporary file which is renamed into place only
+    on success, so a call abandoned after a timeout can never overwrite a
+    good result. Timed-out calls can't be interrupted; they finish in the
+    background and their output is discarded.
+
+    timeout applies to network engines. In-process engines (coqui, pyttsx3,
+    system) have no limit unless local_timeout is set, and their calls are
+    serialized per engine: a new call waits for an abandoned one to finish
+    rather than running inference on the same model concurrently.
+    """
+
+    NETWORK_ENGINES = {'edge'}
+
+    def __init__(self, run, primary_engine: str = "system", fallback_engine: str = None,
+                 timeout: float = 300, hedge_after: float = None,
+                 failure_threshold: int = 3, reset_seconds: float = 60,
+                 latency: LatencyTracker = None, breakers: dict = None,
+                 local_timeout: float = None):
+        self.run = run
+        self.primary_engine = primary_engine
+        self.fallback_engine = fallback_engine
+        self.timeout = timeout
+        self.local_timeout = local_timeout
+        self.hedge_after = hedge_after
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.latency = latency or LatencyTracker()
+        self._breakers = breakers if breakers is not None else {}  # may be shared between policies
+        self._attempt_ids = itertools.count(1)
+        self._engine_locks = {}
+
+    @classmethod
+    def for_speech_engine(cls, speech_engine, **options) -> "ChunkExecutionPolicy":
+        """Policy that runs chunks through speech_engine.generate, primary engine preset"""
+        return cls(lambda engine, text, output_path: speech_engine.generate(text, output_path, engine=engine),
+                   primary_engine=speech_engine.engine, **options)
+    
+    def breaker(self, engine: str) -> CircuitBreaker:
+        return self._breakers.setdefault(engine, CircuitBreaker(self.failure_threshold, self.reset_seconds))
+
+    def execute(self, text: str, output_path: str, engine: str = None) -> bool:
+        """Generate output_path with the primary engine, falling back on failure
+
+        An open breaker only skips an engine while another candidate can take
+        the page. If every candidate's breaker is open, the page waits for the
+        primary's half-open probe instead of being dropped; if that probe
+        fails too, AllEnginesFailing is raised so the conversion stops rather
+        than waiting reset_seconds for every remaining page.
+        """
+        primary = engine or self.primary_engine
+        candidates = [primary]
+        if self.fallback_engine and self.fallback_engine != primary and AVAILABLE_ENGINES.get(self.fallback_engine):
+            candidates.append(self.fallback_engine)
+
+        attempted = False
+        for candidate in candidates:
+            breaker = self.breaker(candidate)
+            if not breaker.allow():
+                print(f"⚡ {candidate} circuit open - skipping")
+                continue
+            attempted = True
+            if self._try(candidate, breaker, text, output_path, primary):
+                return True
+
+        if not attempted:
+            breaker = self.breaker(primary)
+            print(f"⏳ All engines' circuits open - waiting to retry {primary}")
+            breaker.wait_until_allowed()
+            if not self._try(primary, breaker, text, output_path, primary):
+                raise AllEnginesFailing(f"{primary} is still failing after a {self.reset_seconds:g}s pause "
+                                        f"and no fallback engine is available")
+            return True
+        return False
+
+    def _try(self, engine: str, breaker: CircuitBreaker, text: str, output_path: str, primary: str) -> bool:
+        if self._attempt(engine, text, output_path):
+            breaker.record_success()
+            if engine != primary:
+                print(f"↪️  {os.path.basename(output_path)} generated by fallback engine {engine}")
+            return True
+        breaker.record_failure()
+        return False
+
+    def timeout_for(self, engine: str):
+        """Seconds allowed per chunk on engine, or None for no limit"""
+        return (self.timeout if engine in self.NETWORK_ENGINES else self.local_timeout) or None
+
+    def _launch(self, engine: str, text: str, output_path: str):
+        """Start one synthesis call on its own daemon thread"""
+        from concurrent.futures import Future
+
+        target = Path(output_path)
+        temp_path = str(target.with_name(f"{target.stem}.{engine}-{next(self._attempt_ids)}.part{target.suffix}"))
+        future = Future()
+        future.temp_path = temp_path
+
+        lock = None
+        if engine not in self.NETWORK_ENGINES:
+            lock = self._engine_locks.setdefault(engine, threading.Lock())
+
+        def call():
+            try:
+                if lock is None:
+                    future.set_result(bool(self.run(engine, text, temp_path)))
+                else:
+                    with lock:
+                        future.set_result(bool(self.run(engine, text, temp_path)))
+            except Exception as e:
+                print(f"❌ {engine} failed: {e}")
+                future.set_result(False)
+
+        threading.Thread(target=call, daemon=True).start()
+        return future
+
+    @staticmethod
+    def _discard(future):
+        """Delete an attempt's temporary file once it has finished"""
+        def remove(done):
+            try:
+                os.unlink(done.temp_path)
+            except OSError:
+                pass
+        future.add_done_callback(remove)
+
+    def _attempt(self, engine: str, text: str, output_path: str) -> bool:
+        from concurrent.futures import wait, FIRST_COMPLETED
+
+        start = time.monotonic()
+        timeout = self.timeout_for(engine)
+        deadline = start + timeout if timeout else float("inf")
+        hedge = self.hedge_after is not None and engine in self.NETWORK_ENGINES
+        hedge_at = start + self.hedge_after if hedge else None
+        pending = {self._launch(engine, text, output_path)}
+
+        while pending:
+            now = time.monotonic()
+            if now >= deadline:
+                print(f"⏱️  {engine} timed out after {timeout:g}s")
+                break
+            if hedge_at is not None and now >= hedge_at:
+                print(f"🔀 {engine} slow - sending hedged duplicate request")
+                pending.add(self._launch(engine, text, output_path))
+                hedge_at = None
+
+            wake_at = deadline if hedge_at is None else min(deadline, hedge_at)
+            wait_seconds = None if wake_at == float("inf") else max(0.0, wake_at - time.monotonic())
+            done, pending = wait(pending, timeout=wait_seconds, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.result() and os.path.exists(future.temp_path):
+                    os.replace(future.temp_path, output_path)
+                    self.latency.record(engine, time.monotonic() - start, ok=True)
+                    for other in pending | (done - {future}):
+                        self._discard(other)
+                    return True
+                self._discard(future)
+
+        self.latency.record(engine, time.monotonic() - start, ok=False)
+        for future in pending:
+            self._discard(future)
+        return False
+
+
+def convert_pdf_to_audiobook(pdf_path: str, output_dir: str, generate, progress=None,
+                             summary_extra: dict = None, page_delay: float = 0.0,
+                             low_memory: bool = False, max_rss_mb: float = None,
+                             latency: LatencyTracker = None, stitch: bool = False) -> dict:
+    """Convert every page of a PDF to page_NNN.wav files and write a summary
+
+    generate(text, output_path) -> bool produces one audio file.
+    progress(page_num, total_pages, message) is called before each page.
+    low_memory streams pages in windows instead of extracting the whole
+    document up front; max_rss_mb aborts with MemoryError above that RSS.
+    latency adds per-engine p50/p95/p99 timings to the summary.
+    stitch moves sentences split by a page break onto one page and streams
+    every finished page into a single normalized audiobook.wav.
+    """
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    if low_memory:
+        pages = iter_pdf_pages(pdf_path, max_rss_mb=max_rss_mb)
+    else:
+        pages_text = extract_pdf_text(pdf_path)
+        if not any(p.strip() for p in pages_text):
+            raise ValueError("No readable text found in PDF!")
+        pages = ((page_num, len(pages_text), text) for page_num, text in enumerate(pages_text, 1))
+
+    if stitch:
+        pages = carry_sentence_fragments(pages)
+        stitcher = AudiobookStitcher(output_path / AUDIOBOOK_FILE)
+    else:
+        pages = (page + (True,) for page in pages)
+        stitcher = None
+
+    successful = 0
+    failed_pages = []
+    pages_with_text = 0
+    total_pages = 0
+    audiobook = None
+
+    try:
+        for page_num, total_pages, page_text, page_ends_sentence in pages:
+            if not page_text.strip():
+                continue
+            pages_with_text += 1
+
+            if progress:
+                progress(page_num, total_pages, f"🎵 Converting page {page_num}/{total_pages} to audio...")
+
+            # Generate audio file for this page
+            audio_file = output_path / f"page_{page_num:03d}.wav"
+            if generate(page_text, str(audio_file)):
+                successful += 1
+                print(f"✅ Generated: {audio_file}")
+                if stitcher:
+                    stitcher.add_page(str(audio_file), page_ends_sentence)
+            else:
+                failed_pages.append(page_num)
+                print(f"❌ Failed: page {page_num}")
+
+            if page_delay:
+                time.sleep(page_delay)  # Small delay to prevent overwhelming system
+
+            check_rss_ceiling(max_rss_mb)
+    finally:
+        if stitcher:
+            audiobook = stitcher.close()
+
+    if not pages_with_text:
+        raise ValueError("No readable text found in PDF!")
+
+    summary = {
+        "timestamp": datetime.now().isoformat(),
+        "source_pdf": str(pdf_path),
+        "total_pages": total_pages,
+        "pages_with_text": pages_with_text,
+        "successful_conversions": successful,
+        "failed_pages": failed_pages,
+        "output_directory": str(output_path)
+    }
+    if latency is not None:
+        summary["engine_latency"] = latency.summary()
+    if audiobook:
+        summary["audiobook"] = audiobook
+    summary.update(summary_extra or {})
+
+    with open(output_path / "conversion_summary.json", 'w') as f:
+        json.dump(summary, f, indent=2)
+
+    return summary
+
+
 class CompletePDFAudiobookConverter:
     """Complete working PDF audiobook converter with voice cloning"""
     
@@ -101,11 +1332,21 @@ class CompletePDFAudiobookConverter:
         self.output_dir = tk.StringVar(value="audiobook_with_cloning")
         self.selected_engine = tk.StringVar(value="system")
         self.use_voice_cloning = tk.BooleanVar(value=False)  # Fixed: use value= parameter
+        self.low_memory = tk.BooleanVar(value=False)
+        self.stitch_audiobook = tk.BooleanVar(value=False)
+        self.fallback_engine = tk.StringVar(value="none")
+        self.page_timeout = tk.IntVar(value=300)
+        self.library_voice = tk.StringVar()
     
         # Progress
         self.progress_var = tk.DoubleVar()
         self.status_var = tk.StringVar(value="Ready to convert PDF to audiobook")
         
+        # Shared TTS runner - keeps Coqui models loaded across pages and runs
+        self.voice_library = open_voice_library()
+        self.speech_engine = SpeechEngine(voice_library=self.voice_library)
+        self.execution_policy = ChunkExecutionPolicy(self.run_engine)
+        
         self.setup_gui()
         self.check_available_engines()
     
@@ -166,6 +1407,15 @@ class CompletePDFAudiobookConverter:
                                        command=lambda e=engine: self.install_engine(e))
                 install_btn.pack(side=tk.RIGHT)
         
+        fallback_frame = ttk.Frame(engine_frame)
+        fallback_frame.pack(fill=tk.X, pady=(5, 0))
+        ttk.Label(fallback_frame, text="Fallback engine if a page fails or times out:").pack(side=tk.LEFT)
+        ttk.Combobox(fallback_frame, textvariable=self.fallback_engine, state="readonly", width=12,
+                     values=["none"] + [e for e in engines_info if AVAILABLE_ENGINES.get(e)]).pack(side=tk.LEFT, padx=5)
+        ttk.Label(fallback_frame, text="Online engine timeout (s, 0 = none):").pack(side=tk.LEFT, padx=(10, 0))
+        ttk.Spinbox(fallback_frame, from_=0, to=3600, increment=30, width=6,
+                    textvariable=self.page_timeout).pack(side=tk.LEFT, padx=5)
+        
         # Voice Cloning Section - STEP 3
         voice_frame = ttk.LabelFrame(main_frame, text="STEP 3: Voice Cloning (Optional)", padding="10")
         voice_frame.pack(fill=tk.X, pady=10)
@@ -196,6 +1446,21 @@ class CompletePDFAudiobookConverter:
                                      command=self.browse_voice_sample, state="disabled")
         self.voice_button.pack(side=tk.RIGHT, padx=(5, 0))
         
+        # Saved narrator voices (preprocessed, embeddings precomputed)
+        library_frame = ttk.Frame(self.voice_sample_frame)
+        library_frame.pack(fill=tk.X, pady=(5, 0))
+        
+        ttk.Label(library_frame, text="Or use a saved voice:").pack(side=tk.LEFT)
+        self.library_combo = ttk.Combobox(library_frame, textvariable=self.library_voice, width=20,
+                                          state="disabled",
+                                          values=self.voice_library.names() if self.voice_library else [])
+        self.library_combo.pack(side=tk.LEFT, padx=5)
+        self.library_combo.bind("<<ComboboxSelected>>", self.select_library_voice)
+        
+        self.save_voice_button = ttk.Button(library_frame, text="Save Sample to Library",
+                                          command=self.save_voice_to_library, state="disabled")
+        self.save_voice_button.pack(side=tk.RIGHT)
+        
         # Output Directory - STEP 4
         output_frame = ttk.LabelFrame(main_frame, text="STEP 4: Output Directory", padding="10")
         output_frame.pack(fill=tk.X, pady=10)
@@ -206,6 +1471,11 @@ class CompletePDFAudiobookConverter:
         ttk.Entry(output_entry_frame, textvariable=self.output_dir, width=60).pack(side=tk.LEFT, fill=tk.X, expand=True)
         ttk.Button(output_entry_frame, text="Browse", command=self.browse_output).pack(side=tk.RIGHT, padx=(5, 0))
         
+        ttk.Checkbutton(output_frame, text="Low-memory mode (for very large PDFs)",
+                       variable=self.low_memory).pack(anchor=tk.W, pady=(5, 0))
+        ttk.Checkbutton(output_frame, text="Also stitch pages into one audiobook.wav (even volume, smooth joins)",
+                       variable=self.stitch_audiobook).pack(anchor=tk.W)
+        
         # Progress Section
         progress_frame = ttk.LabelFrame(main_frame, text="STEP 5: Conversion Progress", padding="10")
         progress_frame.pack(fill=tk.X, pady=10)
@@ -262,10 +1532,14 @@ class CompletePDFAudiobookConverter:
         if self.use_voice_cloning.get():
             self.voice_entry.config(state="normal")
             self.voice_button.config(state="normal")
+            self.library_combo.config(state="readonly")
+            self.save_voice_button.config(state="normal")
             self.convert_button.config(text="START PDF TO AUDIOBOOK CONVERSION\n(WITH VOICE CLONING ENABLED)", bg="red")
         else:
             self.voice_entry.config(state="disabled")
             self.voice_button.config(state="disabled")
+            self.library_combo.config(state="disabled")
+            self.save_voice_button.config(state="disabled")
             self.convert_button.config(text="START PDF TO AUDIOBOOK CONVERSION\n(Standard TTS - No Voice Cloning)", bg="green")
     
     def quick_convert(self):
@@ -290,6 +1564,42 @@ class CompletePDFAudiobookConverter:
         if filename:
             self.voice_sample_path.set(filename)
     
+    def select_library_voice(self, event=None):
+        """Use a saved voice's cleaned sample for cloning"""
+        name = self.library_voice.get()
+        if name and self.voice_library:
+            self.voice_sample_path.set(self.voice_library.sample_path(name))
+    
+    def save_voice_to_library(self):
+        """Preprocess the selected voice sample and store it in the voice library"""
+        sample = self.voice_sample_path.get()
+        if not sample or not os.path.exists(sample):
+            messagebox.showerror("Error", "Please select a voice sample first!")
+            return
+        
+        name = simpledialog.askstring("Save Voice", "Name for this voice (letters, digits, - and _):")
+        if not name:
+            return
+        
+        def save():
+            try:
+                self.status_var.set(f"Preprocessing voice '{name}'...")
+                if self.voice_library is None:
+                    self.voice_library = VoiceLibrary()
+                    self.speech_engine.voice_library = self.voice_library
+                
+                tts = self.speech_engine.load_coqui_model(XTTS_MODEL) if AVAILABLE_ENGINES.get('coqui') else None
+                voice = self.voice_library.add(name, sample, tts=tts)
+                self.library_combo.config(values=self.voice_library.names())
+                self.library_voice.set(name)
+                self.voice_sample_path.set(voice["sample_path"])
+                self.status_var.set(f"✅ Voice '{name}' saved to library ({voice['duration']}s)")
+            except Exception as e:
+                self.status_var.set(f"❌ Could not save voice '{name}'")
+                messagebox.showerror("Error", f"Could not save voice:\n{e}")
+        
+        threading.Thread(target=save, daemon=True).start()
+    
     def browse_output(self):
         dirname = filedialog.askdirectory(title="Select Output Directory")
         if dirname:
@@ -440,150 +1750,69 @@ class CompletePDFAudiobookConverter:
         self.status_var.set(message)
         self.root.update_idletasks()
 
-    def generate_audio_file(self, text: str, output_path: str) -> bool:
-        """Generate audio file using selected engine with voice cloning check"""
-        try:
-            # Check if we should use voice cloning
-            use_cloning = self.is_voice_cloning_enabled()
-            
-            # Select the appropriate generation method
-            engine = self.selected_engine.get()
-            
-            if use_cloning and engine == 'coqui':
-                self.log_status(f"🎭 Generating audio with VOICE CLONING using Coqui TTS...")
-                return self.coqui_tts(text, output_path)
-            else:
-                if use_cloning and engine != 'coqui':
-                    self.log_status(f"⚠️  Voice cloning requested but {engine} doesn't support it - using standard TTS")
-                else:
-                    self.log_status(f"🔊 Generating audio with standard {engine} TTS...")
-                
-                # Use the selected standard engine
-                if engine == 'system':
-                    return self.system_tts(text, output_path)
-                elif engine == 'pyttsx3':
-                    return self.pyttsx3_tts(text, output_path)
-                elif engine == 'edge':
-                    return self.edge_tts(text, output_path)
-                else:
-                    return self.system_tts(text, output_path)  # Fallback
-                    
-        except Exception as e:
-            self.log_status(f"❌ Error generating audio: {str(e)}")
-            return False
-
-    def system_tts(self, text: str, output_path: str) -> bool:
-        """Windows system TTS"""
-        try:
-            safe_text = text.replace('"', '""')
-            ps_script = f'''
-Add-Type -AssemblyName System.Speech
-$synth = New-Object System.Speech.Synthesis.SpeechSynthesizer
-$synth.SetOutputToWaveFile("{output_path}")
-$synth.Speak("{safe_text}")
-$synth.Dispose()
-'''
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.ps1', delete=False) as f:
-                f.write(ps_script)
-                script_path = f.name
-            
-            result = subprocess.run(['powershell', '-ExecutionPolicy', 'Bypass', '-File', script_path], 
-                                  capture_output=True)
-            
-            os.unlink(script_path)
-            return result.returncode == 0 and os.path.exists(output_path)
-            
-        except Exception as e:
-            print(f"System TTS failed: {e}")
-            return False
-    
-    def pyttsx3_tts(self, text: str, output_path: str) -> bool:
-        """pyttsx3 TTS"""
-        try:
-            import pyttsx3
-            engine = pyttsx3.init()
-            engine.save_to_file(text, output_path)
-            engine.runAndWait()
-            return os.path.exists(output_path)
-        except Exception as e:
-            print(f"pyttsx3 TTS failed: {e}")
-            return False
-    
-    def edge_tts(self, text: str, output_path: str) -> bool:
-        """Microsoft Edge TTS"""
-        try:
-            import asyncio
-            import edge_tts
-            
-            async def generate():
-                voice = "en-US-JennyNeural"
-                communicate = edge_tts.Communicate(text, voice)
-                await communicate.save(output_path)
-            
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(generate())
-            loop.close()
-            
-            return os.path.exists(output_path)
-        except Exception as e:
-            print(f"Edge TTS failed: {e}")
-            return False
-    
-    def coqui_tts(self, text: str, output_path: str) -> bool:
-        """Coqui TTS with voice cloning"""
+    def generate_audio_file(self, text: str, output_path: str) -> bool:
+        """Generate audio file using selected engine with voice cloning check"""
         try:
-            from TTS.api import TTS
+            # Check if we should use voice cloning
+            use_cloning = self.is_voice_cloning_enabled()
             
-            if self.use_voice_cloning.get() and self.voice_sample_path.get():
-                # Use XTTS for voice cloning
-                tts = TTS("tts_models/multilingual/multi-dataset/xtts_v2", gpu=False)
-                tts.tts_to_file(
-                    text=text,
-                    speaker_wav=self.voice_sample_path.get(),
-                    language="en",
-                    file_path=output_path
-                )
+            # Select the appropriate generation method
+            engine = self.selected_engine.get()
+            
+            if use_cloning and engine == 'coqui':
+                self.log_status(f"🎭 Generating audio with VOICE CLONING using Coqui TTS...")
+            elif use_cloning and engine != 'coqui':
+                self.log_status(f"⚠️  Voice cloning requested but {engine} doesn't support it - using standard TTS")
             else:
-                # Use standard TTS
-                tts = TTS("tts_models/en/ljspeech/tacotron2-DDC", gpu=False)
-                tts.tts_to_file(text=text, file_path=output_path)
+                self.log_status(f"🔊 Generating audio with standard {engine} TTS...")
             
-            return os.path.exists(output_path)
+            # Timeout, circuit breaker and fallback engine are handled by the policy
+            fallback = self.fallback_engine.get()
+            self.execution_policy.fallback_engine = None if fallback == "none" else fallback
+            try:
+                self.execution_policy.timeout = self.page_timeout.get() or None
+            except tk.TclError:
+                pass  # Keep the previous timeout if the field isn't a number
+            return self.execution_policy.execute(text, output_path, engine)
+                    
+        except AllEnginesFailing:
+            raise  # Stop the conversion instead of stalling on every remaining page
         except Exception as e:
-            print(f"Coqui TTS failed: {e}")
+            self.log_status(f"❌ Error generating audio: {str(e)}")
             return False
     
+    def run_engine(self, engine: str, text: str, output_path: str) -> bool:
+        """Run one synthesis call on the named engine"""
+        if engine == 'coqui':
+            return self.coqui_tts(text, output_path)
+        elif engine == 'pyttsx3':
+            return self.pyttsx3_tts(text, output_path)
+        elif engine == 'edge':
+            return self.edge_tts(text, output_path)
+        else:
+            return self.system_tts(text, output_path)
+
+    def system_tts(self, text: str, output_path: str) -> bool:
+        """Windows system TTS"""
+        return self.speech_engine.system_tts(text, output_path)
+    
+    def pyttsx3_tts(self, text: str, output_path: str) -> bool:
+        """pyttsx3 TTS"""
+        return self.speech_engine.pyttsx3_tts(text, output_path)
+    
+    def edge_tts(self, text: str, output_path: str) -> bool:
+        """Microsoft Edge TTS"""
+        return self.speech_engine.edge_tts(text, output_path)
+    
+    def coqui_tts(self, text: str, output_path: str) -> bool:
+        """Coqui TTS with voice cloning (models stay loaded between pages)"""
+        self.speech_engine.use_voice_cloning = self.use_voice_cloning.get()
+        self.speech_engine.voice_sample_path = self.voice_sample_path.get()
+        return self.speech_engine.coqui_tts(text, output_path)
+    
     def extract_pdf_text(self, pdf_path: str) -> list:
         """Extract text from PDF"""
-        if not PDF_SUPPORT:
-            raise ImportError("PDF libraries not installed. Click 'Install All Dependencies'")
-        
-        pages_text = []
-        try:
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    text = page.extract_text()
-                    if text:
-                        # Clean text
-                        text = ' '.join(text.split())
-                        text = text.replace('\n', ' ').replace('\t', ' ')
-                        pages_text.append(text)
-                    else:
-                        pages_text.append("")
-        except Exception as e:
-            # Fallback to PyPDF2
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text = page.extract_text()
-                    if text:
-                        text = ' '.join(text.split())
-                        pages_text.append(text)
-                    else:
-                        pages_text.append("")
-        
-        return pages_text
+        return extract_pdf_text(pdf_path)
     
     def start_complete_conversion(self):
         """MAIN CONVERSION FUNCTION with comprehensive voice cloning checks"""
@@ -633,66 +1862,39 @@ $synth.Dispose()
                 self.convert_button.config(state="disabled")
                 self.progress_var.set(0)
                 
-                # Create output directory
-                output_path = Path(self.output_dir.get())
-                output_path.mkdir(exist_ok=True)
-                
                 self.status_var.set("📖 Extracting text from PDF...")
                 self.root.update_idletasks()
                 
-                # Extract PDF text
-                pages_text = self.extract_pdf_text(self.pdf_path.get())
-                non_empty_pages = [p for p in pages_text if p.strip()]
-                
-                if not non_empty_pages:
-                    raise ValueError("No readable text found in PDF!")
-                
-                self.status_var.set(f"📄 Found {len(non_empty_pages)} pages with text. Starting audio generation...")
-                
-                # Process each page
-                successful = 0
-                total_pages = len(pages_text)
-                
-                for page_num, page_text in enumerate(pages_text, 1):
-                    if not page_text.strip():
-                        continue
-                    
-                    self.status_var.set(f"🎵 Converting page {page_num}/{total_pages} to audio...")
-                    progress = (page_num / total_pages) * 100
-                    self.progress_var.set(progress)
+                def report_progress(page_num, total_pages, message):
+                    self.status_var.set(message)
+                    self.progress_var.set((page_num / total_pages) * 100)
                     self.root.update_idletasks()
-                    
-                    # Generate audio file for this page
-                    audio_file = output_path / f"page_{page_num:03d}.wav"
-                    success = self.generate_audio_file(page_text, str(audio_file))
-                    
-                    if success:
-                        successful += 1
-                        print(f"✅ Generated: {audio_file}")
-                    else:
-                        print(f"❌ Failed: page {page_num}")
-                    
-                    time.sleep(0.1)  # Small delay to prevent overwhelming system
                 
-                # Create conversion summary
+                # Extract text and generate one audio file per page
                 final_cloning_status = self.is_voice_cloning_enabled()
-                summary = {
-                    "timestamp": datetime.now().isoformat(),
-                    "source_pdf": self.pdf_path.get(),
-                    "voice_cloning_enabled": final_cloning_status,
-                    "voice_sample": self.voice_sample_path.get() if final_cloning_status else None,
-                    "tts_engine": self.selected_engine.get(),
-                    "total_pages": total_pages,
-                    "pages_with_text": len(non_empty_pages),
-                    "successful_conversions": successful,
-                    "output_directory": str(output_path)
-                }
-                
-                with open(output_path / "conversion_summary.json", 'w') as f:
-                    json.dump(summary, f, indent=2)
+                conversion_latency = self.execution_policy.latency = LatencyTracker()
+                summary = convert_pdf_to_audiobook(
+                    self.pdf_path.get(),
+                    self.output_dir.get(),
+                    self.generate_audio_file,
+                    progress=report_progress,
+                    summary_extra={
+                        "voice_cloning_enabled": final_cloning_status,
+                        "voice_sample": self.voice_sample_path.get() if final_cloning_status else None,
+                        "tts_engine": self.selected_engine.get()
+                    },
+                    page_delay=0.1,
+                    low_memory=self.low_memory.get(),
+                    latency=conversion_latency,
+                    stitch=self.stitch_audiobook.get()
+                )
+                output_path = summary["output_directory"]
+                total_pages = summary["total_pages"]
+                pages_with_text = summary["pages_with_text"]
+                successful = summary["successful_conversions"]
                 
                 self.progress_var.set(100)
-                self.status_var.set(f"🎉 CONVERSION COMPLETED! {successful}/{len(non_empty_pages)} pages successful.")
+                self.status_var.set(f"🎉 CONVERSION COMPLETED! {successful}/{pages_with_text} pages successful.")
                 
                 # Show completion message
                 clone_status = "WITH VOICE CLONING 🎭" if final_cloning_status else "WITHOUT VOICE CLONING 🔊"
@@ -701,7 +1903,7 @@ $synth.Dispose()
                     f"PDF to Audiobook conversion completed {clone_status}!\n\n"
                     f"📊 RESULTS:\n"
                     f"• Total pages: {total_pages}\n"
-                    f"• Pages with text: {len(non_empty_pages)}\n"
+                    f"• Pages with text: {pages_with_text}\n"
                     f"• Successful conversions: {successful}\n"
                     f"• TTS Engine: {self.selected_engine.get()}\n"
                     f"• Voice cloning: {'Enabled 🎭' if final_cloning_status else 'Disabled 🔊'}\n"
@@ -785,7 +1987,1190 @@ print(f"PyTorch version: {torch.__version__}")
         
         threading.Thread(target=install, daemon=True).start()
 
+def process_alive(pid: int):
+    """True if pid is running on this machine, False if not, None if unknown"""
+    try:
+        import psutil
+        return psutil.pid_exists(pid)
+    except ImportError:
+        pass
+    if os.name != "posix":
+        return None  # os.kill(pid, 0) would terminate the process on Windows
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return None
+    return True
+
+
+class BatchJobQueue:
+    """Persistent SQLite job queue with priorities and crash-safe leasing
+
+    A worker leases a job for lease_seconds and must heartbeat to keep it.
+    Leases left behind by a crashed worker expire and the job is handed out
+    again, until max_attempts is reached and the job is marked failed.
+    Leases of dead processes on this host can be reclaimed straight away
+    with reclaim_dead_workers().
+    """
+    
+    PENDING = "pending"
+    LEASED = "leased"
+    DONE = "done"
+    FAILED = "failed"
+    
+    def __init__(self, db_path: str = "voicecraft_jobs.db", lease_seconds: float = 600, max_attempts: int = 3):
+        self.db_path = str(db_path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    pdf_path TEXT NOT NULL,
+                    output_dir TEXT NOT NULL,
+                    engine TEXT NOT NULL,
+                    voice_sample TEXT,
+                    priority INTEGER NOT NULL DEFAULT 0,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    lease_owner TEXT,
+                    lease_expires REAL,
+                    error TEXT,
+                    result TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_pick ON jobs (status, priority DESC, id)")
+    
+    def _connect(self):
+        """Open a connection - one per call so threads never share one"""
+        import sqlite3
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return _ClosingConnection(conn)
+    
+    def enqueue(self, pdf_path: str, output_dir: str, engine: str = "system",
+                voice_sample: str = None, priority: int = 0) -> int:
+        """Add a job, returning its id"""
+        now = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO jobs (pdf_path, output_dir, engine, voice_sample, priority, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (str(pdf_path), str(output_dir), engine, voice_sample or None, int(priority), self.PENDING, now, now)
+            )
+            return cursor.lastrowid
+    
+    def lease(self, worker_id: str):
+        """Atomically claim the highest-priority pending job, or return None"""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._reclaim_expired(conn, now)
+                row = conn.execute(
+                    "SELECT * FROM jobs WHERE status = ? ORDER BY priority DESC, id LIMIT 1",
+                    (self.PENDING,)
+                ).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+                
+                conn.execute(
+                    "UPDATE jobs SET status = ?, attempts = attempts + 1, lease_owner = ?, "
+                    "lease_expires = ?, updated_at = ? WHERE id = ?",
+                    (self.LEASED, worker_id, now + self.lease_seconds, now, row["id"])
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        
+        job = dict(row)
+        job.update(status=self.LEASED, attempts=row["attempts"] + 1, lease_owner=worker_id)
+        return job
+    
+    def _reclaim_expired(self, conn, now: float):
+        """Return jobs whose lease ran out to the queue (or fail them)"""
+        conn.execute(
+            "UPDATE jobs SET status = ?, lease_owner = NULL, lease_expires = NULL, "
+            "error = 'lease expired', updated_at = ? "
+            "WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+            (self.FAILED, now, self.LEASED, now, self.max_attempts)
+        )
+        conn.execute(
+            "UPDATE jobs SET status = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+            "WHERE status = ? AND lease_expires < ?",
+            (self.PENDING, now, self.LEASED, now)
+        )
+    
+    def reclaim_dead_workers(self, host: str) -> int:
+        """Expire leases held by exited processes on host, returning how many
+
+        Worker ids are "<host>-<pid>-<n>". Leases whose owner can't be
+        checked are left to expire normally.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                dead = []
+                for row in conn.execute("SELECT id, lease_owner FROM jobs WHERE status = ?", (self.LEASED,)):
+                    parts = (row["lease_owner"] or "").rsplit("-", 2)
+                    if len(parts) != 3 or parts[0] != host or not parts[1].isdigit():
+                        continue
+                    pid = int(parts[1])
+                    if pid != os.getpid() and process_alive(pid) is False:
+                        dead.append(row["id"])
+                
+                conn.executemany("UPDATE jobs SET lease_expires = 0 WHERE id = ?", [(job_id,) for job_id in dead])
+                self._reclaim_expired(conn, now)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return len(dead)
+    
+    def heartbeat(self, job_id: int, worker_id: str) -> bool:
+        """Extend a lease; False means the lease was lost to another worker"""
+        now = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires = ?, updated_at = ? "
+                "WHERE id = ? AND status = ? AND lease_owner = ?",
+                (now + self.lease_seconds, now, job_id, self.LEASED, worker_id)
+            )
+            return cursor.rowcount == 1
+    
+    def complete(self, job_id: int, worker_id: str, result: dict = None) -> bool:
+        """Mark a leased job done"""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, lease_owner = NULL, lease_expires = NULL, error = NULL, "
+                "result = ?, updated_at = ? WHERE id = ? AND status = ? AND lease_owner = ?",
+                (self.DONE, json.dumps(result) if result is not None else None, time.time(),
+                 job_id, self.LEASED, worker_id)
+            )
+            return cursor.rowcount == 1
+    
+    def fail(self, job_id: int, worker_id: str, error: str) -> bool:
+        """Record a failed attempt; the job is retried until max_attempts"""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+                "lease_owner = NULL, lease_expires = NULL, error = ?, updated_at = ? "
+                "WHERE id = ? AND status = ? AND lease_owner = ?",
+                (self.max_attempts, self.FAILED, self.PENDING, str(error), time.time(),
+                 job_id, self.LEASED, worker_id)
+            )
+            return cursor.rowcount == 1
+    
+    def get(self, job_id: int):
+        """Return a job as a dict, or None"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            return dict(row) if row else None
+    
+    def jobs(self, status: str = None) -> list:
+        """List jobs in pick order, optionally filtered by status"""
+        with self._connect() as conn:
+            if status:
+                rows = conn.execute("SELECT * FROM jobs WHERE status = ? ORDER BY priority DESC, id", (status,))
+            else:
+                rows = conn.execute("SELECT * FROM jobs ORDER BY priority DESC, id")
+            return [dict(row) for row in rows]
+    
+    def counts(self) -> dict:
+        """Number of jobs per status"""
+        counts = {status: 0 for status in (self.PENDING, self.LEASED, self.DONE, self.FAILED)}
+        with self._connect() as conn:
+            for row in conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"):
+                counts[row["status"]] = row["n"]
+        return counts
+
+
+class _ClosingConnection:
+    """Context manager that closes (not just commits) a sqlite3 connection"""
+    
+    def __init__(self, conn):
+        self.conn = conn
+    
+    def __enter__(self):
+        return self.conn
+    
+    def __exit__(self, *exc_info):
+        self.conn.close()
+
+
+class BatchWorkerPool:
+    """Worker threads that drain a BatchJobQueue with warm TTS engines
+
+    Each worker keeps one SpeechEngine per (engine, voice sample) for its
+    whole lifetime, so models and speaker latents load once per night
+    instead of once per document.
+    """
+    
+    def __init__(self, queue: BatchJobQueue, workers: int = 1, heartbeat_seconds: float = 30,
+                 low_memory: bool = False, max_rss_mb: float = None,
+                 fallback_engine: str = None, chunk_timeout: float = 300, hedge_after: float = None,
+                 local_timeout: float = None,
+                 voice_library: VoiceLibrary = None, stitch: bool = False, engine_factory=SpeechEngine):
+        self.queue = queue
+        self.workers = max(1, int(workers))
+        self.heartbeat_seconds = heartbeat_seconds
+        self.low_memory = low_memory
+        self.max_rss_mb = max_rss_mb
+        self.voice_library = voice_library
+        self.stitch = stitch
+        self.engine_factory = engine_factory
+        
+        # Shared by every worker so latency stats and breaker state cover the whole pool
+        self.latency = LatencyTracker()
+        self.breakers = {}
+        self.policy_options = dict(fallback_engine=fallback_engine, timeout=chunk_timeout,
+                                   local_timeout=local_timeout, hedge_after=hedge_after,
+                                   latency=self.latency, breakers=self.breakers)
+        self._stop = threading.Event()
+    
+    def stop(self):
+        """Ask workers to exit after their current job"""
+        self._stop.set()
+    
+    def run(self) -> dict:
+        """Process jobs until the queue is empty, then return status counts"""
+        reclaimed = self.queue.reclaim_dead_workers(platform.node())
+        if reclaimed:
+            print(f"♻️  Reclaimed {reclaimed} job(s) left behind by a crashed run")
+        
+        threads = [
+            threading.Thread(target=self._worker, args=(f"{platform.node()}-{os.getpid()}-{i}",), daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for engine, stats in self.latency.summary().items():
+            print(f"⏱️  {engine}: {stats}")
+        return self.queue.counts()
+    
+    def _worker(self, worker_id: str):
+        engines = {}
+        
+        while not self._stop.is_set():
+            job = self.queue.lease(worker_id)
+            if job is None:
+                return
+            
+            key = (job["engine"], job["voice_sample"] or "")
+            if key not in engines:
+                speech_engine = self.engine_factory(job["engine"], job["voice_sample"] or "",
+                                                    use_voice_cloning=bool(job["voice_sample"]),
+                                                    voice_library=self.voice_library)
+                engines[key] = (speech_engine,
+                                ChunkExecutionPolicy.for_speech_engine(speech_engine, **self.policy_options))
+            
+            self._process(worker_id, job, *engines[key])
+    
+    def _process(self, worker_id: str, job: dict, speech_engine: SpeechEngine, policy: ChunkExecutionPolicy):
+        print(f"📚 [{worker_id}] Job {job['id']} (attempt {job['attempts']}): {job['pdf_path']}")
+        finished = threading.Event()
+        lease_lost = threading.Event()
+        
+        def keep_lease():
+            # Runs for the whole job, so a long extraction or a slow page can't outlast the lease
+            while not finished.wait(self.heartbeat_seconds):
+                try:
+                    if not self.queue.heartbeat(job["id"], worker_id):
+                        lease_lost.set()
+                        return
+                except Exception as e:
+                    print(f"⚠️ [{worker_id}] Heartbeat failed, retrying: {e}")
+        
+        def report_progress(page_num, total_pages, message):
+            if lease_lost.is_set():
+                raise RuntimeError("Lease lost - job was reclaimed by another worker")
+        
+        # Per-job numbers for the summary; the pool-wide tracker still sees every call
+        job_latency = policy.latency = LatencyTracker(parent=self.latency)
+        heartbeat = threading.Thread(target=keep_lease, daemon=True)
+        heartbeat.start()
+        try:
+            summary = convert_pdf_to_audiobook(
+                job["pdf_path"],
+                job["output_dir"],
+                policy.execute,
+                progress=report_progress,
+                summary_extra={
+                    "voice_cloning_enabled": speech_engine.cloning_active,
+                    "voice_sample": speech_engine.voice_sample_path if speech_engine.cloning_active else None,
+                    "tts_engine": speech_engine.engine,
+                    "job_id": job["id"]
+                },
+                low_memory=self.low_memory,
+                max_rss_mb=self.max_rss_mb,
+                latency=job_latency,
+                stitch=self.stitch
+            )
+            if summary["successful_conversions"] == 0:
+                raise RuntimeError("No pages converted successfully")
+            self.queue.complete(job["id"], worker_id, summary)
+            print(f"✅ [{worker_id}] Job {job['id']} done: "
+                  f"{summary['successful_conversions']}/{summary['pages_with_text']} pages")
+        except Exception as e:
+            self.queue.fail(job["id"], worker_id, str(e))
+            print(f"❌ [{worker_id}] Job {job['id']} failed: {e}")
+        finally:
+            finished.set()
+            heartbeat.join()
+
+
+def load_batch_manifest(manifest_path: str) -> list:
+    """Read a JSON manifest - a list of PDF paths or job objects
+
+    Job objects accept: pdf, output_dir, engine, voice_sample, voice, priority.
+    voice names a saved voice from the voice library.
+    Relative paths are resolved against the manifest's folder.
+    """
+    base = Path(manifest_path).parent
+    with open(manifest_path) as f:
+        entries = json.load(f)
+    
+    jobs = []
+    for entry in entries:
+        if isinstance(entry, str):
+            entry = {"pdf": entry}
+        job = dict(entry)
+        job["pdf"] = str(base / job["pdf"])
+        for key in ("output_dir", "voice_sample"):
+            if job.get(key):
+                job[key] = str(base / job[key])
+        jobs.append(job)
+    return jobs
+
+
+class ServiceJob:
+    """State of one conversion job submitted over HTTP"""
+    
+    def __init__(self, job_id: str, job_dir: Path, engine: str, voice: str = None, voice_sample: str = ""):
+        self.id = job_id
+        self.job_dir = job_dir
+        self.pdf_path = job_dir / "source.pdf"
+        self.output_dir = job_dir / "audio"
+        self.engine = engine
+        self.voice = voice
+        self.voice_sample = voice_sample
+        self.status = "queued"
+        self.error = None
+        self.summary = None
+        self.created_at = time.time()
+        self.finished_at = None
+        
+        # Replayable event history (only the latest progress event is kept)
+        self.events = []
+        self.subscribers = set()
+        self._next_event_id = 1
+    
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed")
+    
+    def audio_ready(self, name: str) -> bool:
+        """False for in-flight attempt files and for the audiobook until the job is done"""
+        if not name.endswith(".wav") or name.endswith(".part.wav"):
+            return False
+        return name != AUDIOBOOK_FILE or self.status == "done"
+    
+    def to_dict(self) -> dict:
+        progress = next((e for e in reversed(self.events) if e["event"] == "progress"), None)
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "engine": self.engine,
+            "voice": self.voice,
+            "created_at": self.created_at,
+            "progress": progress["data"] if progress else None,
+            "error": self.error,
+            "summary": self.summary,
+            "audio_files": sorted(
+                p.name for p in self.output_dir.glob("*.wav") if self.audio_ready(p.name)
+            ) if self.output_dir.exists() else []
+        }
+
+
+class ConversionService:
+    """Local asyncio HTTP service that runs PDF conversions on a bounded worker pool
+
+    Endpoints:
+        GET  /health                      service and queue status
+        POST /jobs?engine=NAME            upload a PDF (raw application/pdf or
+                                          multipart/form-data), returns job_id
+        GET  /jobs                        list jobs
+        GET  /jobs/{id}                   job status and summary
+        GET  /jobs/{id}/events            progress as Server-Sent Events
+        GET  /jobs/{id}/audio/{file}.wav  finished audio, supports Range requests
+        DELETE /jobs/{id}                 remove a finished job and its files
+        GET  /voices                      saved voices usable as ?voice=NAME
+
+    Finished jobs and their files are removed job_ttl seconds after they end
+    (None keeps them until deleted).
+    """
+    
+    REASONS = {
+        200: "OK", 202: "Accepted", 206: "Partial Content", 400: "Bad Request",
+        404: "Not Found", 405: "Method Not Allowed", 411: "Length Required",
+        409: "Conflict", 413: "Payload Too Large", 415: "Unsupported Media Type",
+        416: "Range Not Satisfiable", 429: "Too Many Requests",
+        431: "Request Header Fields Too Large", 500: "Internal Server Error",
+        503: "Service Unavailable"
+    }
+    STREAM_CHUNK = 64 * 1024
+    
+    def __init__(self, work_dir: str = "voicecraft_service", host: str = "127.0.0.1", port: int = 8765,
+                 workers: int = 2, default_engine: str = "system", voice_sample: str = "",
+                 max_upload_bytes: int = 200 * 1024 * 1024, max_pending_jobs: int = 32,
+                 max_connections: int = 64, max_header_bytes: int = 64 * 1024,
+                 request_timeout: float = 60, sse_keepalive: float = 15,
+                 low_memory: bool = False, max_rss_mb: float = None,
+                 fallback_engine: str = None, chunk_timeout: float = 300, hedge_after: float = None,
+                 local_timeout: float = None, job_ttl: float = 24 * 3600,
+                 voice_library: VoiceLibrary = None, stitch: bool = False, engine_factory=SpeechEngine):
+        from concurrent.futures import ThreadPoolExecutor
+        
+        self.work_dir = Path(work_dir)
+        self.host = host
+        self.port = port
+        self.workers = max(1, int(workers))
+        self.default_engine = default_engine
+        self.voice_sample = voice_sample or ""
+        self.max_upload_bytes = max_upload_bytes
+        self.max_pending_jobs = max_pending_jobs
+        self.max_connections = max_connections
+        self.max_header_bytes = max_header_bytes
+        self.request_timeout = request_timeout
+        self.sse_keepalive = sse_keepalive
+        self.low_memory = low_memory
+        self.max_rss_mb = max_rss_mb
+        self.voice_library = voice_library
+        self.stitch = stitch
+        self.job_ttl = job_ttl
+        self.engine_factory = engine_factory
+        self.latency = LatencyTracker()
+        self.breakers = {}
+        self.policy_options = dict(fallback_engine=fallback_engine, timeout=chunk_timeout,
+                                   local_timeout=local_timeout, hedge_after=hedge_after,
+                                   latency=self.latency, breakers=self.breakers)
+        
+        self.jobs = {}
+        self._reserved = 0  # Slots held by uploads still in progress
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="voicecraft-worker")
+        self._local = threading.local()
+        self._connections = 0
+        self._server = None
+        self._loop = None
+        self._pruner = None
+    
+    # --- Lifecycle ---
+    
+    async def start(self):
+        """Bind the listening socket; port=0 picks a free port"""
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        self._loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port,
+                                                  limit=self.max_header_bytes)
+        self.port = self._server.sockets[0].getsockname()[1]
+        if self.job_ttl:
+            self._pruner = asyncio.ensure_future(self._prune_loop())
+        print(f"🌐 VoiceCraft service listening on http://{self.host}:{self.port}")
+        return self
+    
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+    
+    async def close(self):
+        if self._pruner is not None:
+            self._pruner.cancel()
+            self._pruner = None
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        self.executor.shutdown(wait=False)
+    
+    async def _prune_loop(self):
+        """Periodically drop finished jobs older than job_ttl"""
+        while True:
+            await self.prune_expired()
+            await asyncio.sleep(min(self.job_ttl / 4, 300))
+    
+    async def prune_expired(self) -> int:
+        """Remove finished jobs, and job folders left by earlier runs, older than job_ttl"""
+        if not self.job_ttl:
+            return 0
+        cutoff = time.time() - self.job_ttl
+        expired = [job for job in self.jobs.values() if job.finished and job.finished_at < cutoff]
+        for job in expired:
+            await self._remove_job(job)
+        
+        def stale_folders():
+            # Folders of in-flight uploads are fresh, so only leftovers from a previous run match
+            return [path for path in self.work_dir.iterdir()
+                    if path.is_dir() and path.name not in self.jobs and path.stat().st_mtime < cutoff]
+        
+        leftovers = await self._blocking(stale_folders)
+        for path in leftovers:
+            await self._blocking(lambda: shutil.rmtree(path, ignore_errors=True))
+        if expired or leftovers:
+            print(f"🧹 Removed {len(expired) + len(leftovers)} expired job(s)")
+        return len(expired) + len(leftovers)
+    
+    async def _remove_job(self, job: ServiceJob):
+        self.jobs.pop(job.id, None)
+        await self._blocking(lambda: shutil.rmtree(job.job_dir, ignore_errors=True))
+    
+    # --- Conversion (worker threads) ---
+    
+    def _engine_for(self, engine_name: str, voice_sample: str):
+        """Per-thread warm engine and execution policy - models are not shared between threads"""
+        engines = getattr(self._local, "engines", None)
+        if engines is None:
+            engines = self._local.engines = {}
+        key = (engine_name, voice_sample)
+        if key not in engines:
+            speech_engine = self.engine_factory(engine_name, voice_sample,
+                                                use_voice_cloning=bool(voice_sample),
+                                                voice_library=self.voice_library)
+            engines[key] = (speech_engine,
+                            ChunkExecutionPolicy.for_speech_engine(speech_engine, **self.policy_options))
+        return engines[key]
+    
+    def _run_job(self, job: ServiceJob):
+        speech_engine, policy = self._engine_for(job.engine, job.voice_sample)
+        # Per-job numbers for the summary; /health keeps the service-wide tracker
+        job_latency = policy.latency = LatencyTracker(parent=self.latency)
+        
+        def report_progress(page_num, total_pages, message):
+            self._publish(job, "progress", {"page": page_num, "total_pages": total_pages, "message": message})
+        
+        self._publish(job, "status", {"status": "running"})
+        try:
+            summary = convert_pdf_to_audiobook(
+                str(job.pdf_path),
+                str(job.output_dir),
+                policy.execute,
+                progress=report_progress,
+                summary_extra={
+                    "voice_cloning_enabled": speech_engine.cloning_active,
+                    "tts_engine": job.engine,
+                    "voice": job.voice,
+                    "job_id": job.id
+                },
+                low_memory=self.low_memory,
+                max_rss_mb=self.max_rss_mb,
+                latency=job_latency,
+                stitch=self.stitch
+            )
+            self._publish(job, "done", summary)
+        except Exception as e:
+            self._publish(job, "failed", {"error": str(e)})
+    
+    def _publish(self, job: ServiceJob, event: str, data: dict):
+        """Hand an event from a worker thread to the event loop"""
+        self._loop.call_soon_threadsafe(self._record_event, job, event, data)
+    
+    def _record_event(self, job: ServiceJob, event: str, data: dict):
+        if event == "status":
+            job.status = data["status"]
+        elif event == "done":
+            job.status = "done"
+            job.summary = data
+        elif event == "failed":
+            job.status = "failed"
+            job.error = data["error"]
+        if job.finished and job.finished_at is None:
+            job.finished_at = time.time()
+        
+        record = {"id": job._next_event_id, "event": event, "data": data}
+        job._next_event_id += 1
+        if event == "progress" and job.events and job.events[-1]["event"] == "progress":
+            job.events[-1] = record
+        else:
+            job.events.append(record)
+        
+        for queue in job.subscribers:
+            queue.put_nowait(record)
+    
+    # --- HTTP ---
+    
+    async def _handle_connection(self, reader, writer):
+        if self._connections >= self.max_connections:
+            await self._send_json(writer, 503, {"error": "Too many connections"})
+            await self._close_writer(writer)
+            return
+        
+        self._connections += 1
+        try:
+            try:
+                head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), self.request_timeout)
+            except asyncio.LimitOverrunError:
+                await self._send_json(writer, 431, {"error": "Request headers too large"})
+                return
+            except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+                return
+            
+            try:
+                method, target, headers = self._parse_head(head)
+            except ValueError:
+                await self._send_json(writer, 400, {"error": "Malformed request"})
+                return
+            
+            await self._route(method, target, headers, reader, writer)
+        except ConnectionError:
+            pass
+        except Exception as e:
+            print(f"❌ Service error: {e}")
+            try:
+                await self._send_json(writer, 500, {"error": "Internal server error"})
+            except Exception:
+                pass
+        finally:
+            self._connections -= 1
+            await self._close_writer(writer)
+    
+    @staticmethod
+    def _parse_head(head: bytes):
+        lines = head.decode("latin-1").split("\r\n")
+        method, target, version = lines[0].split(" ")
+        if not version.startswith("HTTP/1."):
+            raise ValueError(version)
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+        return method.upper(), target, headers
+    
+    async def _route(self, method, target, headers, reader, writer):
+        from urllib.parse import urlsplit, parse_qs, unquote
+        
+        url = urlsplit(target)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        parts = [unquote(p) for p in url.path.split("/") if p]
+        
+        if parts == ["health"] and method == "GET":
+            return await self._send_json(writer, 200, {
+                "status": "ok",
+                "workers": self.workers,
+                "active_jobs": self._active_jobs(),
+                "engines": [name for name, ok in AVAILABLE_ENGINES.items() if ok],
+                "circuit_breakers": {name: breaker.state for name, breaker in self.breakers.items()},
+                "engine_latency": self.latency.summary()
+            })
+        
+        if parts == ["voices"] and method == "GET":
+            voices = self.voice_library.voices() if self.voice_library else []
+            return await self._send_json(writer, 200, {"voices": [
+                {"name": v["name"], "duration": v["duration"], "embedding": bool(v["embedding_path"])}
+                for v in voices
+            ]})
+        
+        if parts == ["jobs"]:
+            if method == "POST":
+                return await self._create_job(headers, query, reader, writer)
+            if method == "GET":
+                return await self._send_json(writer, 200, {"jobs": [job.to_dict() for job in self.jobs.values()]})
+            return await self._send_json(writer, 405, {"error": "Method not allowed"})
+        
+        if len(parts) >= 2 and parts[0] == "jobs":
+            job = self.jobs.get(parts[1])
+            if job is None:
+                return await self._send_json(writer, 404, {"error": "Unknown job"})
+            if method == "DELETE" and len(parts) == 2:
+                if not job.finished:
+                    return await self._send_json(writer, 409, {"error": "Job is still running"})
+                await self._remove_job(job)
+                return await self._send_json(writer, 200, {"job_id": job.id, "deleted": True})
+            if method != "GET":
+                return await self._send_json(writer, 405, {"error": "Method not allowed"})
+            if len(parts) == 2:
+                return await self._send_json(writer, 200, job.to_dict())
+            if parts[2:] == ["events"]:
+                return await self._stream_events(job, writer)
+            if len(parts) == 4 and parts[2] == "audio":
+                return await self._send_audio(job, parts[3], headers, writer)
+        
+        await self._send_json(writer, 404, {"error": "Not found"})
+    
+    def _active_jobs(self) -> int:
+        return self._reserved + sum(1 for job in self.jobs.values() if not job.finished)
+    
+    async def _create_job(self, headers, query, reader, writer):
+        import uuid
+        
+        if "chunked" in headers.get("transfer-encoding", "").lower() or "content-length" not in headers:
+            return await self._send_json(writer, 411, {"error": "Content-Length required"})
+        try:
+            length = int(headers["content-length"])
+        except ValueError:
+            return await self._send_json(writer, 400, {"error": "Invalid Content-Length"})
+        if length <= 0:
+            return await self._send_json(writer, 400, {"error": "Empty upload"})
+        if length > self.max_upload_bytes:
+            return await self._send_json(writer, 413, {"error": f"Upload exceeds {self.max_upload_bytes} bytes"})
+        if self._active_jobs() >= self.max_pending_jobs:
+            return await self._send_json(writer, 429, {"error": "Job queue is full, retry later"})
+        
+        engine = query.get("engine", self.default_engine)
+        if not AVAILABLE_ENGINES.get(engine):
+            return await self._send_json(writer, 400, {"error": f"Engine '{engine}' not available"})
+        
+        voice = query.get("voice")
+        voice_sample = self.voice_sample
+        if voice:
+            voice_record = self.voice_library.get(voice) if self.voice_library else None
+            if voice_record is None:
+                return await self._send_json(writer, 400, {"error": f"Unknown voice '{voice}'"})
+            voice_sample = voice_record["sample_path"]
+        
+        content_type = headers.get("content-type", "application/pdf")
+        media_type = content_type.split(";")[0].strip().lower()
+        if media_type not in ("application/pdf", "application/octet-stream", "multipart/form-data"):
+            return await self._send_json(writer, 415, {"error": "Send application/pdf or multipart/form-data"})
+        
+        job_id = uuid.uuid4().hex[:12]
+        job = ServiceJob(job_id, self.work_dir / job_id, engine, voice, voice_sample)
+        
+        # Hold the slot while the body uploads so concurrent uploads can't overshoot max_pending_jobs
+        self._reserved += 1
+        try:
+            if not await self._receive_upload(job, length, content_type, reader, writer):
+                return
+            self.jobs[job.id] = job
+        finally:
+            self._reserved -= 1
+        
+        self._loop.run_in_executor(self.executor, self._run_job, job)
+        print(f"➕ Service job {job.id} queued ({engine})")
+        
+        await self._send_json(writer, 202, {
+            "job_id": job.id,
+            "status_url": f"/jobs/{job.id}",
+            "events_url": f"/jobs/{job.id}/events"
+        })
+    
+    def _blocking(self, func, *args):
+        """Run blocking file I/O on the default executor, off the event loop"""
+        return self._loop.run_in_executor(None, func, *args)
+    
+    async def _receive_upload(self, job: ServiceJob, length: int, content_type: str, reader, writer) -> bool:
+        """Stream the request body to job.pdf_path; sends the error response and returns False on failure
+
+        File I/O runs on the default executor so large uploads never block the event loop.
+        """
+        async def reject(status, message):
+            await self._blocking(lambda: shutil.rmtree(job.job_dir, ignore_errors=True))
+            await self._send_json(writer, status, {"error": message})
+            return False
+        
+        await self._blocking(lambda: job.job_dir.mkdir(parents=True))
+        
+        # Stream the body to disk instead of holding it in memory
+        upload_path = job.job_dir / "upload.bin"
+        remaining = length
+        f = await self._blocking(open, upload_path, "wb")
+        try:
+            while remaining:
+                try:
+                    chunk = await asyncio.wait_for(reader.read(min(self.STREAM_CHUNK, remaining)),
+                                                   self.request_timeout)
+                except asyncio.TimeoutError:
+                    chunk = b""
+                if not chunk:
+                    break
+                await self._blocking(f.write, chunk)
+                remaining -= len(chunk)
+        finally:
+            await self._blocking(f.close)
+        if remaining:
+            return await reject(400, "Upload incomplete")
+        
+        if content_type.split(";")[0].strip().lower() == "multipart/form-data":
+            boundary = content_type.partition("boundary=")[2].strip().strip('"')
+            found = bool(boundary) and await self._blocking(_extract_multipart_file, upload_path,
+                                                            boundary, job.pdf_path)
+            await self._blocking(upload_path.unlink)
+            if not found:
+                return await reject(400, "No file part in multipart upload")
+        else:
+            await self._blocking(upload_path.replace, job.pdf_path)
+        
+        def read_magic():
+            with open(job.pdf_path, "rb") as pdf:
+                return pdf.read(5)
+        
+        if await self._blocking(read_magic) != b"%PDF-":
+            return await reject(415, "Upload is not a PDF")
+        return True
+    
+    async def _stream_events(self, job: ServiceJob, writer):
+        writer.write(self._head(200, {
+            "Content-Type": "text/event-stream",
+            "Cache-Control": "no-cache"
+        }))
+        
+        # Subscribe and snapshot history without yielding, so nothing is missed or repeated
+        queue = asyncio.Queue()
+        job.subscribers.add(queue)
+        try:
+            for record in list(job.events):
+                writer.write(self._sse(record))
+            await writer.drain()
+            if job.finished:
+                return
+            
+            while True:
+                try:
+                    record = await asyncio.wait_for(queue.get(), self.sse_keepalive)
+                except asyncio.TimeoutError:
+                    writer.write(b": keep-alive\n\n")
+                    await writer.drain()
+                    continue
+                writer.write(self._sse(record))
+                await writer.drain()
+                if record["event"] in ("done", "failed"):
+                    return
+        finally:
+            job.subscribers.discard(queue)
+    
+    @staticmethod
+    def _sse(record: dict) -> bytes:
+        return f"id: {record['id']}\nevent: {record['event']}\ndata: {json.dumps(record['data'])}\n\n".encode()
+    
+    async def _send_audio(self, job: ServiceJob, name: str, headers, writer):
+        if Path(name).name != name or not name.endswith(".wav") or name.endswith(".part.wav"):
+            return await self._send_json(writer, 404, {"error": "Not found"})
+        if not job.audio_ready(name):
+            return await self._send_json(writer, 409, {"error": f"{name} is still being written"})
+        path = job.output_dir / name
+        
+        try:
+            f = await self._blocking(open, path, "rb")
+        except OSError:
+            return await self._send_json(writer, 404, {"error": "Not found"})
+        try:
+            size = (await self._blocking(os.fstat, f.fileno())).st_size
+            start, end = 0, size - 1
+            status = 200
+            extra = {}
+            
+            range_header = headers.get("range")
+            if range_header:
+                byte_range = _parse_byte_range(range_header, size)
+                if byte_range is None:
+                    return await self._send_json(writer, 416, {"error": "Invalid range"},
+                                                 {"Content-Range": f"bytes */{size}"})
+                start, end = byte_range
+                status = 206
+                extra["Content-Range"] = f"bytes {start}-{end}/{size}"
+            
+            writer.write(self._head(status, dict({
+                "Content-Type": "audio/wav",
+                "Content-Length": str(end - start + 1),
+                "Accept-Ranges": "bytes"
+            }, **extra)))
+            
+            await self._blocking(f.seek, start)
+            remaining = end - start + 1
+            while remaining:
+                chunk = await self._blocking(f.read, min(self.STREAM_CHUNK, remaining))
+                if not chunk:
+                    break
+                writer.write(chunk)
+                await writer.drain()
+                remaining -= len(chunk)
+        finally:
+            await self._blocking(f.close)
+    
+    def _head(self, status: int, headers: dict) -> bytes:
+        lines = [f"HTTP/1.1 {status} {self.REASONS.get(status, 'Unknown')}", "Connection: close"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+    
+    async def _send_json(self, writer, status: int, payload: dict, headers: dict = None):
+        body = json.dumps(payload).encode()
+        writer.write(self._head(status, dict({
+            "Content-Type": "application/json",
+            "Content-Length": str(len(body))
+        }, **(headers or {}))) + body)
+        await writer.drain()
+    
+    @staticmethod
+    async def _close_writer(writer):
+        if writer.is_closing():
+            return
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except Exception:
+            pass
+
+
+def _parse_byte_range(header: str, size: int):
+    """Parse a single 'bytes=' range into inclusive (start, end), or None if unsatisfiable"""
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec or size == 0:
+        return None
+    first, _, last = spec.strip().partition("-")
+    try:
+        if not first:
+            # Suffix range: the last N bytes
+            length = int(last)
+            if length <= 0:
+                return None
+            return max(0, size - length), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size or end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+def _extract_multipart_file(upload_path: Path, boundary: str, dest_path: Path) -> bool:
+    """Copy the first file part of a multipart body to dest_path without loading it into memory"""
+    import mmap
+    
+    delimiter = b"--" + boundary.encode("latin-1")
+    with open(upload_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        pos = data.find(delimiter)
+        while pos != -1:
+            header_end = data.find(b"\r\n\r\n", pos)
+            if header_end == -1:
+                return False
+            part_headers = data[pos + len(delimiter):header_end].decode("latin-1").lower()
+            body_start = header_end + 4
+            body_end = data.find(b"\r\n" + delimiter, body_start)
+            if body_end == -1:
+                return False
+            
+            if "filename=" in part_headers:
+                with open(dest_path, "wb") as out:
+                    for offset in range(body_start, body_end, ConversionService.STREAM_CHUNK):
+                        out.write(data[offset:min(offset + ConversionService.STREAM_CHUNK, body_end)])
+                return True
+            pos = body_end + 2
+    return False
+
+
+def run_batch_cli(args):
+    """Handle the 'batch' command line"""
+    queue = BatchJobQueue(args.db, lease_seconds=args.lease_seconds, max_attempts=args.max_attempts)
+    
+    if args.batch_command == "add":
+        library = open_voice_library(args.library)
+        
+        def voice_sample_for(entry):
+            voice = entry.get("voice", args.voice)
+            if voice:
+                if library is None:
+                    raise SystemExit(f"No voice library at {args.library}")
+                try:
+                    return library.sample_path(voice)
+                except KeyError:
+                    raise SystemExit(f"Unknown voice '{voice}' - see 'voices list'")
+            return entry.get("voice_sample", args.voice_sample)
+        
+        def engine_for(entry):
+            engine = entry.get("engine", args.engine)
+            if engine not in AVAILABLE_ENGINES:
+                raise SystemExit(f"Unknown engine '{engine}' for {entry['pdf']} - "
+                                 f"choose from {', '.join(sorted(AVAILABLE_ENGINES))}")
+            if not AVAILABLE_ENGINES[engine]:
+                raise SystemExit(f"Engine '{engine}' for {entry['pdf']} is not installed")
+            return engine
+        
+        if args.manifest:
+            entries = load_batch_manifest(args.manifest)
+        else:
+            entries = [{"pdf": str(p)} for p in sorted(Path(args.dir).glob("*.pdf"))]
+        
+        # Validate every entry before queueing any, so a bad manifest queues nothing
+        jobs = [(entry, engine_for(entry), voice_sample_for(entry)) for entry in entries]
+        for entry, engine, voice_sample in jobs:
+            pdf = Path(entry["pdf"])
+            output_dir = entry.get("output_dir") or str(Path(args.output_root) / pdf.stem)
+            job_id = queue.enqueue(pdf, output_dir, engine=engine, voice_sample=voice_sample,
+                                   priority=entry.get("priority", args.priority))
+            print(f"➕ Queued job {job_id}: {pdf}")
+        print(f"📋 Queue: {queue.counts()}")
+    
+    elif args.batch_command == "run":
+        counts = BatchWorkerPool(queue, workers=args.workers, low_memory=args.low_memory,
+                                 max_rss_mb=args.max_rss_mb, fallback_engine=args.fallback_engine,
+                                 chunk_timeout=args.chunk_timeout, local_timeout=args.local_timeout,
+                                 hedge_after=args.hedge_after,
+                                 voice_library=open_voice_library(args.library), stitch=args.stitch).run()
+        print(f"🎉 Batch finished: {counts}")
+    
+    else:
+        for job in queue.jobs():
+            print(f"{job['id']:>5}  {job['status']:<8} p={job['priority']:<3} "
+                  f"tries={job['attempts']}  {job['pdf_path']}" + (f"  ({job['error']})" if job['error'] else ""))
+        print(f"📋 Queue: {queue.counts()}")
+
+
+def run_voices_cli(args):
+    """Handle the 'voices' command line"""
+    if args.voices_command == "add":
+        library = VoiceLibrary(args.library)
+        voice = library.add(args.name, args.sample, compute_embedding=not args.no_embedding)
+        print(f"✅ {voice['name']}: {voice['duration']}s, embedding "
+              f"{'stored' if voice['embedding_path'] else 'computed on first use'}")
+        return
+    
+    library = open_voice_library(args.library)
+    if library is None:
+        print(f"No voice library at {args.library}")
+        return
+    
+    if args.voices_command == "remove":
+        print(f"🗑️  Removed {args.name}" if library.remove(args.name) else f"Unknown voice: {args.name}")
+    else:
+        for voice in library.voices():
+            print(f"{voice['name']:<20} {voice['duration']:>6.1f}s  "
+                  f"embedding: {'yes' if voice['embedding_path'] else 'no'}  ({voice['source_path']})")
+
+
+def run_service_cli(args):
+    """Handle the 'serve' command line"""
+    service = ConversionService(
+        work_dir=args.work_dir,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        default_engine=args.engine,
+        voice_sample=args.voice_sample,
+        max_upload_bytes=int(args.max_upload_mb * 1024 * 1024),
+        max_pending_jobs=args.max_pending_jobs,
+        max_connections=args.max_connections,
+        low_memory=args.low_memory,
+        max_rss_mb=args.max_rss_mb,
+        fallback_engine=args.fallback_engine,
+        chunk_timeout=args.chunk_timeout,
+        local_timeout=args.local_timeout,
+        job_ttl=args.job_ttl_hours * 3600 or None,
+        hedge_after=args.hedge_after,
+        voice_library=open_voice_library(args.library),
+        stitch=args.stitch
+    )
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        print("👋 Service stopped")
+
+
+def build_arg_parser():
+    """Command line: no arguments launches the GUI"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="PDF to Audiobook Converter with Voice Cloning")
+    commands = parser.add_subparsers(dest="command")
+    
+    # Conversion options shared by 'batch run' and 'serve'
+    conversion = argparse.ArgumentParser(add_help=False)
+    conversion.add_argument("--low-memory", action="store_true", help="Stream pages in windows (huge PDFs)")
+    conversion.add_argument("--max-rss-mb", type=float, default=None, help="Fail a job above this process RSS")
+    conversion.add_argument("--fallback-engine", default=None, choices=sorted(AVAILABLE_ENGINES),
+                            help="Engine to retry a page with when the primary fails or times out")
+    conversion.add_argument("--chunk-timeout", type=float, default=300,
+                            help="Seconds allowed per page on network engines (edge)")
+    conversion.add_argument("--local-timeout", type=float, default=None,
+                            help="Seconds allowed per page on coqui/pyttsx3/system (default: no limit)")
+    conversion.add_argument("--hedge-after", type=float, default=None,
+                            help="Send a duplicate request to network engines (edge) after this many seconds")
+    conversion.add_argument("--stitch", action="store_true",
+                            help="Also write one trimmed, crossfaded, loudness-normalized audiobook.wav")
+    
+    batch = commands.add_parser("batch", help="Convert many PDFs through a persistent job queue")
+    batch.add_argument("--db", default="voicecraft_jobs.db", help="SQLite job queue file")
+    batch.add_argument("--lease-seconds", type=float, default=600)
+    batch.add_argument("--max-attempts", type=int, default=3)
+    batch.add_argument("--library", default=DEFAULT_VOICE_LIBRARY, help="Voice library folder")
+    batch_commands = batch.add_subparsers(dest="batch_command", required=True)
+    
+    add = batch_commands.add_parser("add", help="Queue a directory of PDFs or a JSON manifest")
+    source = add.add_mutually_exclusive_group(required=True)
+    source.add_argument("--dir", help="Queue every *.pdf in this directory")
+    source.add_argument("--manifest", help="JSON list of PDF paths or job objects")
+    add.add_argument("--output-root", default="audiobook_with_cloning", help="One sub-folder per PDF")
+    add.add_argument("--engine", default="system", choices=sorted(AVAILABLE_ENGINES))
+    add.add_argument("--voice-sample", default=None, help="Clone this voice (Coqui only)")
+    add.add_argument("--voice", default=None, help="Clone a saved voice from the library (Coqui only)")
+    add.add_argument("--priority", type=int, default=0, help="Higher runs first")
+    
+    run = batch_commands.add_parser("run", help="Process queued jobs until the queue is empty",
+                                    parents=[conversion])
+    run.add_argument("--workers", type=int, default=1)
+    batch_commands.add_parser("status", help="Show every job and its status")
+    
+    voices = commands.add_parser("voices", help="Manage saved narrator voices")
+    voices.add_argument("--library", default=DEFAULT_VOICE_LIBRARY, help="Voice library folder")
+    voices_commands = voices.add_subparsers(dest="voices_command", required=True)
+    
+    voice_add = voices_commands.add_parser("add", help="Clean a voice sample and store its speaker embedding")
+    voice_add.add_argument("name")
+    voice_add.add_argument("sample", help="WAV, MP3, FLAC or M4A recording")
+    voice_add.add_argument("--no-embedding", action="store_true", help="Compute the embedding on first use instead")
+    
+    voices_commands.add_parser("list", help="Show saved voices")
+    
+    voice_remove = voices_commands.add_parser("remove", help="Delete a saved voice")
+    voice_remove.add_argument("name")
+    
+    serve = commands.add_parser("serve", help="Run the local HTTP conversion service",
+                                parents=[conversion])
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765, help="0 picks a free port")
+    serve.add_argument("--workers", type=int, default=2, help="Conversions running at once")
+    serve.add_argument("--work-dir", default="voicecraft_service", help="Uploads and audio per job")
+    serve.add_argument("--engine", default="system", choices=sorted(AVAILABLE_ENGINES), help="Default engine")
+    serve.add_argument("--voice-sample", default="", help="Clone this voice (Coqui only)")
+    serve.add_argument("--library", default=DEFAULT_VOICE_LIBRARY, help="Voice library for ?voice=NAME")
+    serve.add_argument("--max-upload-mb", type=float, default=200)
+    serve.add_argument("--max-pending-jobs", type=int, default=32, help="Reject uploads beyond this (429)")
+    serve.add_argument("--max-connections", type=int, default=64)
+    serve.add_argument("--job-ttl-hours", type=float, default=24,
+                       help="Delete finished jobs and their audio after this long (0 keeps them)")
+    
+    return parser
+
+
 if __name__ == "__main__":
+    args = build_arg_parser().parse_args()
+    
+    if args.command == "batch":
+        run_batch_cli(args)
+        sys.exit(0)
+    if args.command == "voices":
+        run_voices_cli(args)
+        sys.exit(0)
+    if args.command == "serve":
+        run_service_cli(args)
+        sys.exit(0)
+    
     print("Starting Complete PDF Audiobook Converter with Voice Cloning...")
     print(f"Available engines: {[k for k, v in AVAILABLE_ENGINES.items() if v]}")
     
@@ -0,0 +1,66 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import task
+from test_low_memory import write_text_pdf
+from test_service import FakeEngine
+
+
+@unittest.skipUnless(task.PDF_SUPPORT, "pdfplumber/PyPDF2 not installed")
+class BatchWorkerPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        task.AVAILABLE_ENGINES["fake"] = True
+        self.tmp = tempfile.TemporaryDirectory()
+        self.queue = task.BatchJobQueue(os.path.join(self.tmp.name, "jobs.db"))
+
+    def tearDown(self):
+        task.AVAILABLE_ENGINES.pop("fake", None)
+        self.tmp.cleanup()
+
+    def add_book(self, name, pages):
+        pdf_path = os.path.join(self.tmp.name, f"{name}.pdf")
+        write_text_pdf(pdf_path, pages)
+        output_dir = os.path.join(self.tmp.name, name)
+        return self.queue.enqueue(pdf_path, output_dir, engine="fake"), output_dir
+
+    def test_drains_queue_with_per_job_latency(self):
+        first, first_dir = self.add_book("first", 2)
+        second, second_dir = self.add_book("second", 3)
+
+        pool = task.BatchWorkerPool(self.queue, workers=2, engine_factory=FakeEngine)
+        counts = pool.run()
+
+        self.assertEqual(counts["done"], 2)
+        for job_id, output_dir, pages in ((first, first_dir, 2), (second, second_dir, 3)):
+            self.assertEqual(self.queue.get(job_id)["status"], task.BatchJobQueue.DONE)
+            with open(os.path.join(output_dir, "conversion_summary.json")) as f:
+                summary = json.load(f)
+            self.assertEqual(summary["successful_conversions"], pages)
+            # Each summary counts its own document only; the pool keeps the totals
+            self.assertEqual(summary["engine_latency"]["fake"]["calls"], pages)
+        self.assertEqual(pool.latency.summary()["fake"]["calls"], 5)
+
+    def test_failing_engine_fails_job_without_stalling(self):
+        class BrokenEngine(FakeEngine):
+            def generate(self, text, output_path, engine=None):
+                return False
+
+        job_id, _ = self.add_book("broken", 10)
+        queue = task.BatchJobQueue(self.queue.db_path, max_attempts=1)
+        pool = task.BatchWorkerPool(queue, engine_factory=BrokenEngine)
+        pool.breakers["fake"] = task.CircuitBreaker(failure_threshold=3, reset_seconds=0.1)
+        pool.run()
+
+        job = queue.get(job_id)
+        self.assertEqual(job["status"], task.BatchJobQueue.FAILED)
+        self.assertIn("still failing", job["error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
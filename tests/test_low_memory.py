@@ -0,0 +1,117 @@
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import task
+
+
+def write_text_pdf(path, page_count, kids_per_node=50):
+    """Write a minimal PDF with one line of text per page
+
+    Pages hang off intermediate page-tree nodes, like real PDF writers
+    produce, rather than from one huge /Kids array.
+    """
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # root of the page tree, filled in once its children are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    nodes = []
+    for first in range(1, page_count + 1, kids_per_node):
+        objects.append(None)
+        node_id = len(objects)
+        kids = []
+        for page_num in range(first, min(first + kids_per_node, page_count + 1)):
+            text = f"BT /F1 12 Tf 72 720 Td (This is page {page_num} of the test book.) Tj ET".encode()
+            objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(text), text))
+            objects.append(b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] "
+                           b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (node_id, len(objects)))
+            kids.append(b"%d 0 R" % len(objects))
+        objects[node_id - 1] = b"<< /Type /Pages /Parent 2 0 R /Kids [%s] /Count %d >>" % (b" ".join(kids), len(kids))
+        nodes.append(b"%d 0 R" % node_id)
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(nodes), page_count)
+
+    with open(path, "wb") as f:
+        f.write(b"%PDF-1.4\n")
+        offsets = []
+        for obj_id, body in enumerate(objects, 1):
+            offsets.append(f.tell())
+            f.write(b"%d 0 obj\n%s\nendobj\n" % (obj_id, body))
+        xref = f.tell()
+        f.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+        for offset in offsets:
+            f.write(b"%010d 00000 n \n" % offset)
+        f.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+
+
+def peak_iter_memory(pdf_path):
+    """Peak traced allocation while reading every page, plus the page count seen
+
+    Measured from the first page on: the xref index pdfminer loads when the
+    file is opened is a few bytes per object and not what low-memory mode
+    bounds.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        pages = task.iter_pdf_pages(pdf_path)
+        next(pages)
+        seen = 1
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        for page_num, total_pages, text in pages:
+            assert f"page {page_num} of" in text
+            seen += 1
+        return tracemalloc.get_traced_memory()[1] - baseline, seen
+    finally:
+        tracemalloc.stop()
+
+
+@unittest.skipUnless(task.PDF_SUPPORT, "pdfplumber/PyPDF2 not installed")
+class IterPdfPagesMemoryTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.small = os.path.join(cls.tmp.name, "small.pdf")
+        cls.large = os.path.join(cls.tmp.name, "large.pdf")
+        write_text_pdf(cls.small, 200)
+        write_text_pdf(cls.large, 2000)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_peak_memory_does_not_grow_with_page_count(self):
+        small_peak, small_pages = peak_iter_memory(self.small)
+        large_peak, large_pages = peak_iter_memory(self.large)
+
+        self.assertEqual(small_pages, 200)
+        self.assertEqual(large_pages, 2000)
+        # Only pdfminer's visited-page set may grow; keeping any per-page
+        # layout or Page objects around costs several KB a page
+        per_page = (large_peak - small_peak) / (large_pages - small_pages)
+        self.assertLess(per_page, 512,
+                        f"peak {large_peak} bytes for 2000 pages vs {small_peak} for 200")
+
+
+class RssCeilingTest(unittest.TestCase):
+
+    def test_raises_above_ceiling(self):
+        if task.current_rss_mb() is None:
+            self.skipTest("RSS can't be measured on this platform")
+        with self.assertRaises(MemoryError):
+            task.check_rss_ceiling(1)
+
+    def test_no_ceiling_is_a_no_op(self):
+        task.check_rss_ceiling(None)
+        task.check_rss_ceiling(1024 * 1024)
+
+
+if __name__ == "__main__":
+    unittest.main()
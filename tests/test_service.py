@@ -0,0 +1,148 @@
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import task
+from test_low_memory import write_text_pdf
+
+
+class FakeEngine:
+    """Stands in for SpeechEngine: writes the page text as the 'audio'"""
+
+    release = None  # threading.Event that holds every call until set
+
+    def __init__(self, engine, voice_sample="", use_voice_cloning=False, voice_library=None):
+        self.engine = engine
+        self.voice_sample_path = voice_sample
+        self.cloning_active = False
+
+    def generate(self, text, output_path, engine=None):
+        if FakeEngine.release is not None:
+            FakeEngine.release.wait(10)
+        with open(output_path, "wb") as f:
+            f.write(b"RIFF" + text.encode())
+        return True
+
+
+async def request(port, method, path, body=b"", headers=None):
+    """One HTTP/1.1 request; returns (status, headers, body) once the server closes"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    head = [f"{method} {path} HTTP/1.1", "Host: 127.0.0.1"]
+    head += [f"{name}: {value}" for name, value in (headers or {}).items()]
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + body)
+    await writer.drain()
+    response = await asyncio.wait_for(reader.read(), 30)
+    writer.close()
+
+    head, _, payload = response.partition(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    response_headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        response_headers[name.strip().lower()] = value.strip()
+    return int(lines[0].split(" ")[1]), response_headers, payload
+
+
+def upload(port, pdf_bytes, **headers):
+    return request(port, "POST", "/jobs?engine=fake", pdf_bytes,
+                   dict({"Content-Type": "application/pdf", "Content-Length": str(len(pdf_bytes))}, **headers))
+
+
+@unittest.skipUnless(task.PDF_SUPPORT, "pdfplumber/PyPDF2 not installed")
+class ConversionServiceTest(unittest.IsolatedAsyncioTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        pdf_path = os.path.join(cls.tmp.name, "book.pdf")
+        write_text_pdf(pdf_path, 3)
+        with open(pdf_path, "rb") as f:
+            cls.pdf = f.read()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    async def asyncSetUp(self):
+        task.AVAILABLE_ENGINES["fake"] = True
+        FakeEngine.release = None
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.service = None
+
+    async def asyncTearDown(self):
+        if FakeEngine.release is not None:
+            FakeEngine.release.set()
+        if self.service is not None:
+            await self.service.close()
+        task.AVAILABLE_ENGINES.pop("fake", None)
+        self.work_dir.cleanup()
+
+    async def start(self, **options):
+        self.service = task.ConversionService(self.work_dir.name, port=0, default_engine="fake",
+                                              engine_factory=FakeEngine, **options)
+        await self.service.start()
+        return self.service.port
+
+    async def test_upload_events_and_range_download(self):
+        port = await self.start()
+
+        status, _, body = await upload(port, self.pdf)
+        self.assertEqual(status, 202)
+        job_id = json.loads(body)["job_id"]
+
+        status, headers, stream = await request(port, "GET", f"/jobs/{job_id}/events")
+        self.assertEqual(status, 200)
+        self.assertEqual(headers["content-type"], "text/event-stream")
+        events = [line.split(": ", 1)[1] for line in stream.decode().splitlines() if line.startswith("event: ")]
+        self.assertEqual(events[0], "status")
+        self.assertIn("progress", events)
+        self.assertEqual(events[-1], "done")
+
+        status, _, body = await request(port, "GET", f"/jobs/{job_id}")
+        job = json.loads(body)
+        self.assertEqual(job["status"], "done")
+        self.assertEqual(job["audio_files"], ["page_001.wav", "page_002.wav", "page_003.wav"])
+
+        status, headers, body = await request(port, "GET", f"/jobs/{job_id}/audio/page_002.wav",
+                                              headers={"Range": "bytes=0-3"})
+        self.assertEqual(status, 206)
+        self.assertEqual(body, b"RIFF")
+        self.assertTrue(headers["content-range"].startswith("bytes 0-3/"))
+
+        status, headers, _ = await request(port, "GET", f"/jobs/{job_id}/audio/page_002.wav",
+                                           headers={"Range": "bytes=100000-"})
+        self.assertEqual(status, 416)
+        self.assertTrue(headers["content-range"].startswith("bytes */"))
+
+    async def test_upload_too_large(self):
+        port = await self.start(max_upload_bytes=100)
+        status, _, _ = await upload(port, self.pdf)
+        self.assertEqual(status, 413)
+
+    async def test_queue_full(self):
+        FakeEngine.release = threading.Event()
+        port = await self.start(max_pending_jobs=1)
+
+        status, _, _ = await upload(port, self.pdf)
+        self.assertEqual(status, 202)
+        status, _, _ = await upload(port, self.pdf)
+        self.assertEqual(status, 429)
+
+    async def test_not_a_pdf(self):
+        port = await self.start()
+        status, _, body = await upload(port, b"hello, world")
+        self.assertEqual(status, 415)
+        self.assertEqual(json.loads(body)["error"], "Upload is not a PDF")
+
+        status, _, _ = await upload(port, self.pdf, **{"Content-Type": "text/plain"})
+        self.assertEqual(status, 415)
+
+
+if __name__ == "__main__":
+    unittest.main()